@@ -0,0 +1,180 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from threading import Lock
+from typing import Any, NamedTuple
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.api.helper import is_not_modified
+from app.core.settings import settings
+from app.core.versions import VERSIONED_TABLES, table_versions
+
+
+class CachePolicy(NamedTuple):
+    """How the responses of a route are cached."""
+
+    tables: tuple[str, ...]
+    max_age: int = 0
+
+
+class CachedBody(NamedTuple):
+    etag: str
+    body: bytes
+    media_type: str | None
+
+
+def cached(*tables: str, max_age: int = 0) -> Callable:
+    """Opt a GET route in to the response cache.
+
+    Its responses are valid for as long as none of the tables they are
+    read from is written. The route must belong to a router using
+    ``CachedRoute``.
+
+    :param tables: Tables the response is read from, among ``VERSIONED_TABLES``
+    :param max_age: Seconds clients may reuse a response without revalidating it
+    :return: Decorator marking the endpoint
+    """
+    if unknown := set(tables) - set(VERSIONED_TABLES):
+        raise ValueError(f"Tables without versions: {', '.join(sorted(unknown))}")
+
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.cache_policy = CachePolicy(tables, max_age)
+        return endpoint
+
+    return decorate
+
+
+class ResponseCache:
+    """Process-wide LRU cache of rendered response bodies, bounded in entries and bytes.
+
+    Entries are keyed by URL and stored with the ETag they were rendered
+    for; once a table they depend on is written the ETag changes and the
+    entry is simply never hit again until it is evicted.
+    """
+
+    def __init__(self, maxsize: int = 512, max_bytes: int = 32 * 1024 * 1024) -> None:
+        """Initialize a ResponseCache instance.
+
+        :param maxsize: Maximum number of responses kept
+        :param max_bytes: Maximum total size of the bodies kept
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self._items: OrderedDict[str, CachedBody] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str, etag: str) -> CachedBody | None:
+        """Return the cached response of a URL, if rendered for the current ETag.
+
+        :param key: Cache key of the URL
+        :param etag: Current ETag of the response
+        :return: The cached response, or None
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item.etag != etag:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, key: str, item: CachedBody) -> None:
+        """Cache a rendered response, evicting the least recently used ones when over budget.
+
+        :param key: Cache key of the URL
+        :param item: The rendered response
+        """
+        if len(item.body) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+
+            self._items[key] = item
+            self.size += len(item.body)
+
+            while len(self._items) > self.maxsize or self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted.body)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Return the cache counters.
+
+        :return: Hit, miss, 304 and eviction counters, hit rate, entries and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._items),
+            "bytes": self.size,
+        }
+
+
+response_cache = ResponseCache(settings.response_cache_size, settings.response_cache_max_bytes)
+
+
+class CachedRoute(APIRoute):
+    """Route class serving the GET routes marked with ``cached`` from the response cache.
+
+    The ETag of a response is derived from its URL and the versions of the
+    tables it is read from, so it is known before running the endpoint:
+    ``If-None-Match`` is answered with a 304 and repeated requests with the
+    cached body, neither running more than the query reading the versions.
+    Other routes are unaffected.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        policy: CachePolicy | None = getattr(self.endpoint, "cache_policy", None)
+        if policy is None or "GET" not in self.methods:
+            return handler
+
+        cache_control = f"public, max-age={policy.max_age}" if policy.max_age else "no-cache"
+
+        async def cached_handler(request: Request) -> Response:
+            if not settings.response_cache_enabled or request.method != "GET":
+                return await handler(request)
+
+            key = f"{request.url.path}?{'&'.join(sorted(str(request.query_params).split('&')))}"
+            versions = await table_versions.read(*policy.tables)
+            digest = hashlib.blake2b(f"{key}|{versions}".encode(), digest_size=8).hexdigest()
+            etag = f'"{digest}"'
+            headers = {"ETag": etag, "Cache-Control": cache_control}
+
+            if is_not_modified(request, etag):
+                response_cache.not_modified += 1
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            item = response_cache.get(key, etag)
+            if item is not None:
+                return Response(item.body, media_type=item.media_type, headers=headers | {"X-Cache": "HIT"})
+
+            response = await handler(request)
+            if response.status_code == status.HTTP_200_OK and hasattr(response, "body"):
+                response_cache.put(key, CachedBody(etag, bytes(response.body), response.media_type))
+                response.headers.update(headers | {"X-Cache": "MISS"})
+            return response
+
+        return cached_handler
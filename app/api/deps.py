@@ -1,12 +1,46 @@
 from typing import Annotated
 
+from fastapi import Request
 from fastapi.params import Depends
 
-from .schemas import PageParams
+from .schemas import ExportFormat, ExportParams, PageParams
 
+# Query parameters of the pagination itself; any other one given to a listing is a filter
+PAGE_PARAMETERS = {"page", "page_size", "cursor", "include_total", "sort"}
+# Same for exports
+EXPORT_PARAMETERS = {"format", "gzip", "sort"}
 
-def pagination_parameters(page: int = 1, page_size: int = 20) -> PageParams:
-    return PageParams(page=page, page_size=page_size)
+
+def pagination_parameters(
+    request: Request,
+    page: int = 1,
+    page_size: int = 20,
+    cursor: str | None = None,
+    include_total: bool = True,
+    sort: str = "id",
+) -> PageParams:
+    filters = {key: value for key, value in request.query_params.items() if key not in PAGE_PARAMETERS}
+    return PageParams(
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+        sort=sort,
+        filters=filters,
+    )
 
 
 PaginationDep = Annotated[PageParams, Depends(pagination_parameters)]
+
+
+def export_parameters(
+    request: Request,
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    sort: str = "id",
+) -> ExportParams:
+    filters = {key: value for key, value in request.query_params.items() if key not in EXPORT_PARAMETERS}
+    return ExportParams(format=format, gzip=gzip, sort=sort, filters=filters)
+
+
+ExportDep = Annotated[ExportParams, Depends(export_parameters)]
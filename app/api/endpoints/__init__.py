@@ -3,7 +3,15 @@
 from fastapi import APIRouter
 
 from .cards_api import router as cards_router
+from .editions_api import router as editions_router
+from .jobs_api import router as jobs_router
+from .metrics_api import router as metrics_router
+from .pokedex_api import router as pokedex_router
 
 endpoints_router = APIRouter()
 
 endpoints_router.include_router(cards_router)
+endpoints_router.include_router(editions_router)
+endpoints_router.include_router(jobs_router)
+endpoints_router.include_router(metrics_router)
+endpoints_router.include_router(pokedex_router)
@@ -1,40 +1,222 @@
-from fastapi import APIRouter, status
+import asyncio
+import logging
+from email.utils import formatdate
 
-from app.api.deps import PaginationDep
-from app.api.helper import ok
-from app.api.schemas import PageInfo, ResponseModel
-from app.core.db import DbSession
-from app.domain.schemas import CardInput, CardResponse
-from app.service import CardService
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
-router = APIRouter()
+from app.api.cache import CachedRoute, cached
+from app.api.deps import ExportDep, PaginationDep
+from app.api.export import decode_rows, export
+from app.api.helper import fail, is_not_modified, ok, ok_rows, paginate
+from app.api.responses import FastJSONResponse
+from app.api.schemas import ExportFormat, PageInfo, ResponseModel
+from app.core.db import AsyncDbSession
+from app.core.settings import settings
+from app.domain.schemas import (
+    CardBulkInput,
+    CardBulkItemResult,
+    CardBulkReport,
+    CardImportError,
+    CardImportReport,
+    CardInput,
+    CardResponse,
+    JobResponse,
+)
+from app.libs import CircuitOpenError, ImageSize, ImageVariants, PageNotFoundError, TransientFetchError
+from app.service import CardService, JobService, ObjectNotFoundError, job_worker_pool
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=CachedRoute)
+
+image_variants = ImageVariants(settings.images_dir)
+
+# Errors returned by an import; the others are only counted
+MAX_IMPORT_ERRORS = 1000
 
 
 ResponseCard = ResponseModel[CardResponse]
 ResponseCardList = ResponseModel[list[CardResponse]]
+ResponseCardBulk = ResponseModel[CardBulkReport]
+ResponseCardImport = ResponseModel[CardImportReport]
+ResponseJob = ResponseModel[JobResponse]
+
+
+@router.post(
+    "/cards",
+    summary="Post Pokémon card",
+    response_model=ResponseCard,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": ResponseJob, "description": "Card queued for scraping"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Source site throttling or down"},
+    },
+)
+async def post_card(
+    input_card: CardInput,
+    session: AsyncDbSession,
+    background: bool = Query(False, description="Scrape the card in a background job instead of waiting for it"),
+) -> ResponseCard | JSONResponse:
+    """Create a Pokémon card by its ID, set ID, and edition.
 
+    In background mode the card is queued for scraping and the job is
+    returned with a 202; poll ``GET /jobs/{id}`` for its result.
+    """
+    if background:
+        job = await JobService(session=session).enqueue("scrape_card", input_card.model_dump())
+        job_worker_pool.notify()
+        return JSONResponse(
+            jsonable_encoder(ok(data=JobResponse.from_model(job))),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/jobs/{job.id}"},
+        )
 
-@router.post("/cards", summary="Post Pokémon card", response_model=ResponseCard, status_code=status.HTTP_201_CREATED)
-def post_card(input_card: CardInput, session: DbSession) -> ResponseCard:
-    """Create a Pokémon card by its ID, set ID, and edition."""
-    service = CardService(session)
-    card = service.create_card(input_card)
+    service = CardService(session=session)
+    try:
+        card = await service.create(data=input_card)
+    except PageNotFoundError:
+        fail("Carta não encontrada.", status.HTTP_404_NOT_FOUND)
+    except (TransientFetchError, CircuitOpenError):
+        fail("Site de origem indisponível, tente novamente mais tarde.", status.HTTP_503_SERVICE_UNAVAILABLE)
     return ok(data=CardResponse.from_model(card))
 
 
+@router.post("/cards/bulk", summary="Post Pokémon cards in bulk", response_model=ResponseCardBulk)
+async def post_cards_bulk(input_cards: CardBulkInput, session: AsyncDbSession) -> ResponseCardBulk:
+    """Create many Pokémon cards in a single transaction, reporting the result of each item."""
+    service = CardService(session=session)
+    results = await service.create_bulk(items=input_cards.items)
+
+    report = CardBulkReport()
+    for item, status_, card, error in results:
+        setattr(report, status_.value, getattr(report, status_.value) + 1)
+        report.items.append(
+            CardBulkItemResult(
+                card_id=item.card_id,
+                set_id=item.set_id,
+                edition_slug=item.edition_slug,
+                status=status_,
+                card=CardResponse.from_model(card) if card else None,
+                error=error,
+            )
+        )
+    return ok(data=report)
+
+
+@router.post(
+    "/cards/import",
+    summary="Import Pokémon cards from a file",
+    response_model=ResponseCardImport,
+    openapi_extra={"requestBody": {"required": True, "content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def import_cards(
+    request: Request,
+    session: AsyncDbSession,
+    format: ExportFormat = ExportFormat.NDJSON,
+    batch_size: int = Query(1000, ge=1, le=5000, description="Rows written per transaction"),
+) -> ResponseCardImport:
+    """Import Pokémon cards from an NDJSON or CSV file sent as the request body.
+
+    Rows hold ``card_id``, ``set_id``, ``edition_code``, ``name`` and ``rarity``, plus
+    ``edition_name`` and ``edition_year`` to create missing editions: the files of
+    ``GET /cards/export`` are imported as they are. Rows lacking data are scraped. The
+    body is read as it arrives and written in batches, each committed on its own.
+    """
+    service = CardService(session=session)
+    rows = decode_rows(request.stream(), format)
+    report = CardImportReport()
+    async for totals, errors in service.import_cards(rows=rows, batch_size=batch_size):
+        for line, error in errors[: MAX_IMPORT_ERRORS - len(report.errors)]:
+            report.errors.append(CardImportError(line=line, error=error))
+        logger.info("Card import: %s", ", ".join(f"{outcome}: {count}" for outcome, count in totals.items()))
+        report = report.model_copy(update=totals)
+    return ok(data=report)
+
+
 @router.get("/cards", summary="Get all Pokémon cards", response_model=ResponseCardList)
-def list_cards(
+@cached("card", "edition", "pokedexentry")
+async def list_cards(
     pagination: PaginationDep,
-    session: DbSession,
-) -> ResponseCardList:
-    """Retrieve all Pokémon cards."""
-    service = CardService(session)
-    cards, total = service.get_all_cards(page=pagination.page, page_size=pagination.page_size)
-    return ok(
-        data=[CardResponse.from_model(card) for card in cards],
-        metadata=PageInfo(
-            total=total,
-            page=pagination.page,
-            page_size=pagination.page_size,
-        ),
-    )
+    session: AsyncDbSession,
+) -> FastJSONResponse:
+    """Retrieve all Pokémon cards.
+
+    Filter with ``field=value``, ``field__in=a,b``, ``field__gte/gt/lte/lt=value`` or
+    ``field__prefix=value`` on ``id``, ``name`` (all), ``rarity``, ``edition_id`` (equality
+    and ``in``), ``edition_code`` (also prefix) and ``pokedex_id`` (cards in a pokedex, equality
+    and ``in``). Sort with ``sort=[-]id|name|rarity``.
+    """
+    service = CardService(session=session)
+    rows, metadata = await paginate(service, pagination, projection="listing")
+    return ok_rows([row._asdict() for row in rows], metadata=metadata)
+
+
+@router.get("/cards/search", summary="Search Pokémon cards", response_model=ResponseCardList)
+@cached("card", "edition")
+async def search_cards(
+    session: AsyncDbSession,
+    q: str = Query(..., min_length=1, max_length=200, description="Words prefixing the card name, rarity or edition"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    include_total: bool = True,
+) -> FastJSONResponse:
+    """Search Pokémon cards by name, rarity and edition, best matches first.
+
+    Every word must start a word of the card, so ``?q=char ba`` finds
+    Charizard of Base Set: suited to typeahead.
+    """
+    service = CardService(session=session)
+    rows, total = await service.search(query=q, page=page, page_size=page_size, include_total=include_total)
+    return ok_rows([row._asdict() for row in rows], metadata=PageInfo(total=total, page=page, page_size=page_size))
+
+
+@router.get(
+    "/cards/export",
+    summary="Export every Pokémon card",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_cards(params: ExportDep, session: AsyncDbSession) -> StreamingResponse:
+    """Download every Pokémon card with its edition, as NDJSON or CSV, optionally gzipped.
+
+    Streamed from a server-side cursor a batch at a time, so memory stays
+    flat whatever the size of the catalog. Takes the filters and sorts of
+    ``GET /cards``.
+    """
+    return await export(CardService(session=session), params, "cards", projection="export")
+
+
+@router.get(
+    "/cards/{id}/image",
+    summary="Get a Pokémon card image",
+    response_class=FileResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"image/jpeg": {}}},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Cached copy is still valid"},
+        status.HTTP_404_NOT_FOUND: {"description": "Card or image not found"},
+    },
+)
+async def get_card_image(
+    id: int, request: Request, session: AsyncDbSession, size: ImageSize = ImageSize.FULL
+) -> Response:
+    """Serve the image of a Pokémon card, with conditional GET and range support."""
+    service = CardService(session=session)
+    try:
+        card = await service.get_by_id(id)
+        path = await asyncio.to_thread(image_variants.path, card.image_name, size)
+    except (ObjectNotFoundError, FileNotFoundError):
+        fail("Imagem não encontrada.", status.HTTP_404_NOT_FOUND)
+
+    stat = path.stat()
+    headers = {
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": f"public, max-age={settings.image_cache_max_age}",
+    }
+
+    if is_not_modified(request, headers["ETag"], stat.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(path, media_type="image/jpeg", headers=headers, stat_result=stat)
@@ -1,24 +1,33 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.api.deps import PaginationDep
-from app.api.helper import ok
-from app.api.schemas import PageInfo, ResponseModel
-from app.core.db import DbSession
-from app.domain.schemas.edition_schema import EditionLoad, EditionResponse
-from app.service import EditionService
+from app.api.cache import CachedRoute, cached
+from app.api.deps import ExportDep, PaginationDep
+from app.api.export import export
+from app.api.helper import fail, ok, ok_rows, paginate
+from app.api.responses import FastJSONResponse
+from app.api.schemas import ResponseModel
+from app.core.db import AsyncDbSession
+from app.domain.schemas import JobResponse
+from app.domain.schemas.edition_schema import EditionLoad, EditionResponse, EditionSyncReport
+from app.libs import CircuitOpenError, EditionNotFoundError, TransientFetchError
+from app.service import CardService, EditionService, JobService, job_worker_pool
 
-router = APIRouter(prefix="/editions")
+router = APIRouter(prefix="/editions", route_class=CachedRoute)
 
 
 ResponseEdition = ResponseModel[EditionResponse]
 ResponseEditionList = ResponseModel[list[EditionResponse]]
+ResponseEditionSync = ResponseModel[EditionSyncReport]
+ResponseJob = ResponseModel[JobResponse]
 
 
 @router.post("", summary="Create a new edition", response_model=ResponseEdition, status_code=status.HTTP_201_CREATED)
-def create_edition(input_edition: EditionLoad, session: DbSession) -> ResponseEdition:
+async def create_edition(input_edition: EditionLoad, session: AsyncDbSession) -> ResponseEdition:
     """Create a new edition."""
-    service = EditionService(session)
-    edition = service.create(data=input_edition)
+    service = EditionService(session=session)
+    edition = await service.create(data=input_edition)
     return ok(data=EditionResponse.from_model(edition))
 
 
@@ -28,31 +37,84 @@ def create_edition(input_edition: EditionLoad, session: DbSession) -> ResponseEd
     response_model=ResponseEdition,
     status_code=status.HTTP_200_OK,
 )
-def update_edition(edition_id: int, input_edition: EditionLoad, session: DbSession) -> ResponseEdition:
+async def update_edition(edition_id: int, input_edition: EditionLoad, session: AsyncDbSession) -> ResponseEdition:
     """Update an existing edition by its ID."""
-    service = EditionService(session)
-    edition = service.update(id=edition_id, data=input_edition)
+    service = EditionService(session=session)
+    edition = await service.update(id=edition_id, data=input_edition)
     return ok(data=EditionResponse.from_model(edition))
 
 
+@router.get(
+    "/export",
+    summary="Export every edition",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_editions(params: ExportDep, session: AsyncDbSession) -> StreamingResponse:
+    """Download every edition as NDJSON or CSV, optionally gzipped, streamed a batch at a time.
+
+    Takes the filters and sorts of ``GET /editions``.
+    """
+    return await export(EditionService(session=session), params, "editions", projection="listing")
+
+
 @router.get("/{edition_id}", summary="Get an edition by ID", response_model=ResponseEdition)
-def get_edition(edition_id: int, session: DbSession) -> ResponseEdition:
+@cached("edition")
+async def get_edition(edition_id: int, session: AsyncDbSession) -> ResponseEdition:
     """Retrieve an edition by its ID."""
-    service = EditionService(session)
-    edition = service.get_by_id(id=edition_id)
+    service = EditionService(session=session)
+    edition = await service.get_by_id(id=edition_id)
     return ok(data=EditionResponse.from_model(edition))
 
 
 @router.get("", summary="Get all editions", response_model=ResponseEditionList)
-def list_editions(pagination: PaginationDep, session: DbSession) -> ResponseEditionList:
-    """Retrieve all editions."""
-    service = EditionService(session)
-    editions, total = service.get_list(page=pagination.page, page_size=pagination.page_size)
-    return ok(
-        data=[EditionResponse.from_model(edition) for edition in editions],
-        metadata=PageInfo(
-            total=total,
-            page=pagination.page,
-            page_size=pagination.page_size,
-        ),
-    )
+@cached("edition")
+async def list_editions(pagination: PaginationDep, session: AsyncDbSession) -> FastJSONResponse:
+    """Retrieve all editions.
+
+    Filter with ``field=value``, ``field__in=a,b`` or ``field__prefix=value`` on ``code`` and
+    ``name``, and ranges (``field__gte/gt/lte/lt=value``) on ``id`` and ``name``. Sort with
+    ``sort=[-]id|code|name``.
+    """
+    service = EditionService(session=session)
+    rows, metadata = await paginate(service, pagination, projection="listing")
+    return ok_rows([row._asdict() for row in rows], metadata=metadata)
+
+
+@router.post(
+    "/{code}/sync",
+    summary="Sync every card of an edition",
+    response_model=ResponseEditionSync,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": ResponseJob, "description": "Edition queued for syncing"},
+        status.HTTP_404_NOT_FOUND: {"description": "Edition not found on the source site"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Source site throttling or down"},
+    },
+)
+async def sync_edition(
+    code: str,
+    session: AsyncDbSession,
+    background: bool = Query(False, description="Sync the edition in a background job instead of waiting for it"),
+) -> ResponseEditionSync | JSONResponse:
+    """Crawl the card listing pages of an edition and upsert every card, in batches.
+
+    In background mode the sync is queued and the job is returned with a
+    202; poll ``GET /jobs/{id}`` for its report.
+    """
+    if background:
+        job = await JobService(session=session).enqueue("sync_edition", {"edition_slug": code})
+        job_worker_pool.notify()
+        return JSONResponse(
+            jsonable_encoder(ok(data=JobResponse.from_model(job))),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    service = CardService(session=session)
+    try:
+        edition, totals = await service.sync_edition(edition_slug=code)
+    except EditionNotFoundError:
+        fail("Edição não encontrada.", status.HTTP_404_NOT_FOUND)
+    except (TransientFetchError, CircuitOpenError):
+        fail("Site de origem indisponível, tente novamente mais tarde.", status.HTTP_503_SERVICE_UNAVAILABLE)
+    return ok(data=EditionSyncReport(edition=EditionResponse.from_model(edition), **totals))
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, status
+
+from app.api.helper import fail, ok
+from app.api.schemas import ResponseModel
+from app.core.db import AsyncDbSession
+from app.domain.schemas import JobResponse
+from app.service import JobService, ObjectNotFoundError, job_worker_pool
+
+router = APIRouter(prefix="/jobs")
+
+
+ResponseJob = ResponseModel[JobResponse]
+
+
+@router.get("/{job_id}", summary="Get a background job", response_model=ResponseJob)
+async def get_job(job_id: int, session: AsyncDbSession) -> ResponseJob:
+    """Retrieve the status and, once finished, the result or error of a background job."""
+    service = JobService(session=session)
+    try:
+        job = await service.get_by_id(job_id)
+    except ObjectNotFoundError:
+        fail("Job não encontrado.", status.HTTP_404_NOT_FOUND)
+    return ok(data=JobResponse.from_model(job))
+
+
+@router.post("/{job_id}/retry", summary="Retry a dead background job", response_model=ResponseJob)
+async def retry_job(job_id: int, session: AsyncDbSession) -> ResponseJob:
+    """Queue a dead-lettered job again, with a fresh set of attempts."""
+    service = JobService(session=session)
+    try:
+        job = await service.retry(job_id)
+    except ObjectNotFoundError:
+        fail("Job não encontrado.", status.HTTP_404_NOT_FOUND)
+    except ValueError:
+        fail("Somente jobs mortos podem ser reexecutados.", status.HTTP_409_CONFLICT)
+    job_worker_pool.notify()
+    return ok(data=JobResponse.from_model(job))
@@ -0,0 +1,32 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.api.cache import response_cache
+from app.api.helper import ok
+from app.api.schemas import ResponseModel
+from app.libs import page_cache, page_fetcher
+from app.service import edition_cache
+
+router = APIRouter(prefix="/metrics")
+
+
+ResponseMetrics = ResponseModel[dict[str, Any]]
+
+
+@router.get("/scraper", summary="Get scraper metrics", response_model=ResponseMetrics)
+async def get_scraper_metrics() -> ResponseMetrics:
+    """Report the fetch paths, rate limits and circuit breaker of each host, and the page cache counters."""
+    return ok(data={"hosts": page_fetcher.get_stats(), "page_cache": page_cache.get_stats()})
+
+
+@router.get("/responses", summary="Get response cache metrics", response_model=ResponseMetrics)
+async def get_response_cache_metrics() -> ResponseMetrics:
+    """Report the hits, misses, 304s and size of the HTTP response cache."""
+    return ok(data=response_cache.get_stats())
+
+
+@router.get("/editions", summary="Get edition cache metrics", response_model=ResponseMetrics)
+async def get_edition_cache_metrics() -> ResponseMetrics:
+    """Report the hits, misses and size of the cache of edition lookups by code."""
+    return ok(data=edition_cache.get_stats())
@@ -1,41 +1,110 @@
 from fastapi import APIRouter, status
 
+from app.api.cache import CachedRoute, cached
 from app.api.deps import PaginationDep
-from app.api.helper import ok
-from app.api.schemas import PageInfo, ResponseModel
-from app.core.db import DbSession
-from app.domain.models import Pokedex
-from app.domain.schemas.pokedex_scbema import PokedexResponse
-from app.service.pokedex_service import PokedexService
+from app.api.helper import fail, ok, ok_rows, paginate
+from app.api.responses import FastJSONResponse
+from app.api.schemas import ResponseModel
+from app.core.db import AsyncDbSession
+from app.domain.schemas import (
+    CardResponse,
+    PokedexCardsInput,
+    PokedexCardsReport,
+    PokedexInput,
+    PokedexResponse,
+    PokedexStats,
+)
+from app.service import CardService, ObjectNotFoundError, PokedexService
 
-router = APIRouter()
+router = APIRouter(prefix="/pokedexes", route_class=CachedRoute)
 
 
-ResponsePokedex = ResponseModel[Pokedex]
-ResponsePokedexList = ResponseModel[list[Pokedex]]
+ResponsePokedex = ResponseModel[PokedexResponse]
+ResponsePokedexList = ResponseModel[list[PokedexResponse]]
+ResponsePokedexCards = ResponseModel[PokedexCardsReport]
+ResponseCardList = ResponseModel[list[CardResponse]]
+ResponsePokedexStats = ResponseModel[PokedexStats]
 
 
-@router.post("/pokedexes", summary="Post Pokedex", response_model=ResponsePokedex, status_code=status.HTTP_201_CREATED)
-def post_pokedex(input_pokedex: Pokedex, session: DbSession) -> ResponsePokedex:
-    """Create a Pokémon pokedex by its ID, set ID, and edition."""
-    service = PokedexService(session)
-    pokedex = service.create_pokedex(input_pokedex)
+@router.post("", summary="Post Pokedex", response_model=ResponsePokedex, status_code=status.HTTP_201_CREATED)
+async def post_pokedex(input_pokedex: PokedexInput, session: AsyncDbSession) -> ResponsePokedex:
+    """Create a pokedex."""
+    service = PokedexService(session=session)
+    pokedex = await service.create(data=input_pokedex)
     return ok(data=PokedexResponse.from_model(pokedex))
 
 
-@router.get("/pokedexes", summary="Get all pokedexes", response_model=ResponsePokedexList)
-def list_pokedexes(
-    pagination: PaginationDep,
-    session: DbSession,
-) -> ResponsePokedexList:
+@router.get("", summary="Get all pokedexes", response_model=ResponsePokedexList)
+@cached("pokedex")
+async def list_pokedexes(pagination: PaginationDep, session: AsyncDbSession) -> FastJSONResponse:
     """Retrieve all pokedexes."""
-    service = PokedexService(session)
-    pokedexes, total = service.get_all_pokedexes(page=pagination.page, page_size=pagination.page_size)
-    return ok(
-        data=[PokedexResponse.from_model(pokedex) for pokedex in pokedexes],
-        metadata=PageInfo(
-            total=total,
-            page=pagination.page,
-            page_size=pagination.page_size,
-        ),
-    )
+    service = PokedexService(session=session)
+    rows, metadata = await paginate(service, pagination, projection="listing")
+    return ok_rows([row._asdict() for row in rows], metadata=metadata)
+
+
+@router.get("/{pokedex_id}", summary="Get a pokedex by ID", response_model=ResponsePokedex)
+@cached("pokedex")
+async def get_pokedex(pokedex_id: int, session: AsyncDbSession) -> ResponsePokedex:
+    """Retrieve a pokedex by its ID."""
+    service = PokedexService(session=session)
+    try:
+        pokedex = await service.get_by_id(pokedex_id)
+    except ObjectNotFoundError:
+        fail("Pokedex não encontrada.", status.HTTP_404_NOT_FOUND)
+    return ok(data=PokedexResponse.from_model(pokedex))
+
+
+@router.get("/{pokedex_id}/stats", summary="Get the completion of a pokedex", response_model=ResponsePokedexStats)
+@cached("pokedex", "pokedexentry", "card", "edition")
+async def get_pokedex_stats(pokedex_id: int, session: AsyncDbSession) -> ResponsePokedexStats:
+    """Cards owned out of the cards of each edition the pokedex has cards of, by rarity.
+
+    Read from statistics kept up to date as cards and entries change, so it
+    costs the same whatever the size of the pokedex.
+    """
+    service = PokedexService(session=session)
+    try:
+        stats = await service.get_stats(pokedex_id)
+    except ObjectNotFoundError:
+        fail("Pokedex não encontrada.", status.HTTP_404_NOT_FOUND)
+    return ok(data=stats)
+
+
+@router.get("/{pokedex_id}/cards", summary="Get the cards of a pokedex", response_model=ResponseCardList)
+@cached("pokedexentry", "card", "edition")
+async def list_pokedex_cards(pokedex_id: int, pagination: PaginationDep, session: AsyncDbSession) -> FastJSONResponse:
+    """Retrieve the cards of a pokedex, a page at a time.
+
+    Takes the same filters and sorts as ``GET /cards``, which this is with ``pokedex_id``.
+    """
+    pagination = pagination.model_copy(update={"filters": pagination.filters | {"pokedex_id": str(pokedex_id)}})
+    service = CardService(session=session)
+    rows, metadata = await paginate(service, pagination, projection="listing")
+    return ok_rows([row._asdict() for row in rows], metadata=metadata)
+
+
+@router.post("/{pokedex_id}/cards", summary="Add cards to a pokedex", response_model=ResponsePokedexCards)
+async def add_pokedex_cards(
+    pokedex_id: int, input_cards: PokedexCardsInput, session: AsyncDbSession
+) -> ResponsePokedexCards:
+    """Add up to 10000 cards to a pokedex at once; cards already in it are left alone."""
+    service = PokedexService(session=session)
+    try:
+        added, missing = await service.add_cards(pokedex_id, input_cards.card_ids)
+    except ObjectNotFoundError:
+        fail("Pokedex não encontrada.", status.HTTP_404_NOT_FOUND)
+    return ok(data=PokedexCardsReport(requested=len(set(input_cards.card_ids)), added=added, missing=missing))
+
+
+@router.delete("/{pokedex_id}/cards", summary="Remove cards from a pokedex", response_model=ResponsePokedexCards)
+async def remove_pokedex_cards(
+    pokedex_id: int, input_cards: PokedexCardsInput, session: AsyncDbSession
+) -> ResponsePokedexCards:
+    """Remove up to 10000 cards from a pokedex at once."""
+    service = PokedexService(session=session)
+    try:
+        removed = await service.remove_cards(pokedex_id, input_cards.card_ids)
+    except ObjectNotFoundError:
+        fail("Pokedex não encontrada.", status.HTTP_404_NOT_FOUND)
+    return ok(data=PokedexCardsReport(requested=len(set(input_cards.card_ids)), removed=removed))
@@ -0,0 +1,155 @@
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+
+from app.api.helper import fail
+from app.api.responses import dumps, loads
+from app.api.schemas import ExportFormat, ExportParams
+from app.repository import UnknownFilterError
+from app.service.base import BaseService
+
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv; charset=utf-8"}
+
+
+async def encode_rows(batches: AsyncIterator[Sequence[Row]], format: ExportFormat) -> AsyncIterator[bytes]:
+    """Encode batches of rows, one chunk per batch.
+
+    :param batches: Batches of rows, all with the same fields
+    :param format: Output format; CSV starts with a header of the field names
+    :return: Encoded chunks
+    """
+    header = format == ExportFormat.CSV
+    async for batch in batches:
+        if not batch:
+            continue
+
+        fields = batch[0]._fields
+        if format == ExportFormat.NDJSON:
+            # Zipping with the fields read once is about twice as fast as Row._asdict per row
+            yield b"".join(dumps(dict(zip(fields, row, strict=True))) + b"\n" for row in batch)
+            continue
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(fields)
+            header = False
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+async def _records(chunks: AsyncIterable[bytes], quoted: bool) -> AsyncIterator[list[tuple[int, bytes]]]:
+    # Complete records of a file split anywhere, a list per chunk, with the line each starts on; quoted ones may
+    # span lines. Yielding lists keeps a single async hop per chunk rather than per line.
+    pending = record = b""
+    line = start = 0
+
+    def split(lines: list[bytes]) -> list[tuple[int, bytes]]:
+        nonlocal record, line, start
+        records = []
+        for text in lines:
+            line += 1
+            if record:
+                record += b"\n" + text
+            else:
+                record, start = text, line
+            if quoted and record.count(b'"') % 2:
+                continue
+            records.append((start, record))
+            record = b""
+        return records
+
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        yield split(lines)
+
+    records = split([pending] if pending else [])
+    if record:
+        records.append((start, record))
+    yield records
+
+
+async def decode_rows(chunks: AsyncIterable[bytes], format: ExportFormat) -> AsyncIterator[tuple[int, dict | None]]:
+    """Decode the rows of a file as its chunks come, the inverse of ``encode_rows``.
+
+    :param chunks: Chunks of the file, split anywhere
+    :param format: File format; CSV starts with a header of the field names
+    :return: Line number and fields of each row, fields being None when the row is malformed; blank lines are skipped
+    """
+    header = None
+    async for records in _records(chunks, quoted=format == ExportFormat.CSV):
+        for line, record in records:
+            if not record.strip():
+                continue
+
+            try:
+                if format == ExportFormat.NDJSON:
+                    fields = loads(record)
+                    yield line, fields if isinstance(fields, dict) else None
+                    continue
+
+                values = next(csv.reader([record.decode("utf-8-sig" if header is None else "utf-8")]))
+            except (ValueError, csv.Error):
+                yield line, None
+                continue
+
+            if header is None:
+                header = values
+            else:
+                yield line, dict(zip(header, values, strict=True)) if len(values) == len(header) else None
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compress a stream of chunks into a single gzip member, as they come.
+
+    :param chunks: Uncompressed chunks
+    :param level: zlib compression level
+    :return: Compressed chunks
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    batches: AsyncIterator[Sequence[Row]],
+    name: str,
+    format: ExportFormat,
+    compress: bool = False,
+) -> StreamingResponse:
+    """Stream rows as a file download, never holding more than one batch.
+
+    :param batches: Batches of rows read from a server-side cursor
+    :param name: File name, without extension
+    :param format: Output format
+    :param compress: Whether to gzip the body on the fly (sent with Content-Encoding: gzip)
+    :return: The streaming response
+    """
+    chunks = encode_rows(batches, format)
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{format.value}"'}
+    if compress:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+async def export(service: BaseService, params: ExportParams, name: str, projection: str) -> StreamingResponse:
+    """Export every row of a projection a service reads, filtered and sorted, as a streamed file.
+
+    :param service: Service to read the rows from
+    :param params: Export parameters of the request
+    :param name: File name, without extension
+    :param projection: Name of the repository projection exported
+    :return: The streaming response
+    """
+    try:
+        batches = await service.stream_rows(projection=projection, filters=params.filters, sort=params.sort)
+    except UnknownFilterError as e:
+        fail(str(e))
+    return export_response(batches, name, params.format, params.gzip)
@@ -1,8 +1,12 @@
+from email.utils import parsedate_to_datetime
 from typing import Never, TypeVar
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 
-from app.api.schemas import PageInfo, ResponseModel
+from app.api.responses import FastJSONResponse
+from app.api.schemas import PageInfo, PageParams, ResponseModel
+from app.repository import InvalidCursorError, UnknownFilterError
+from app.service.base import BaseService
 
 T = TypeVar("T")
 
@@ -17,6 +21,29 @@ def ok(
     )
 
 
+def ok_rows(
+    rows: list[dict],
+    metadata: PageInfo | None = None,
+) -> FastJSONResponse:
+    """Fast path of ok() for lists, taking rows already shaped as the route's response model.
+
+    The envelope is encoded once, without building or validating a model
+    per row. The route keeps its response_model, which still documents the
+    response in the OpenAPI schema.
+
+    :param rows: Plain dicts, as returned by the response schemas' to_row or a projection Row's _asdict
+    :param metadata: Page metadata
+    :return: The encoded response
+    """
+    return FastJSONResponse(
+        {
+            "metadata": metadata.model_dump() if metadata is not None else None,
+            "data": rows,
+            "error": None,
+        }
+    )
+
+
 def fail(
     message: str,
     status_code: int = status.HTTP_400_BAD_REQUEST,
@@ -25,3 +52,65 @@ def fail(
         status_code=status_code,
         detail=message,
     )
+
+
+async def paginate(
+    service: BaseService,
+    pagination: PageParams,
+    projection: str | None = None,
+) -> tuple[list, PageInfo]:
+    """Read a page from a service, by cursor when possible and by offset otherwise.
+
+    :param service: Service to read the entities from
+    :param pagination: Pagination parameters of the request
+    :param projection: Name of a repository projection to read rows of, instead of entities
+    :return: A tuple containing the entities (or rows) and the page metadata
+    """
+    query = {
+        "page_size": pagination.page_size,
+        "include_total": pagination.include_total,
+        "projection": projection,
+        "filters": pagination.filters,
+        "sort": pagination.sort,
+    }
+    try:
+        if not pagination.use_cursor:
+            items, total = await service.get_list(page=pagination.page, **query)
+            return items, PageInfo(total=total, page=pagination.page, page_size=pagination.page_size)
+
+        items, total, next_cursor, prev_cursor = await service.get_list_by_cursor(cursor=pagination.cursor, **query)
+    except (InvalidCursorError, UnknownFilterError) as e:
+        fail(str(e))
+
+    return items, PageInfo(
+        total=total,
+        page=None if pagination.cursor else 1,
+        page_size=pagination.page_size,
+        next=next_cursor,
+        prev=prev_cursor,
+    )
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float | None = None) -> bool:
+    """Whether the client's cached copy is still valid, so a 304 can be answered.
+
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+
+    :param request: The incoming request
+    :param etag: Current ETag of the resource, quoted
+    :param last_modified: Current modification time of the resource, as a timestamp
+    :return: True when the response can be 304 Not Modified
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast encoder
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain data (dicts, lists, str, numbers, datetimes) to JSON, with orjson when installed.
+
+    :param content: Data to encode
+    :return: UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+
+
+def loads(content: bytes | str) -> Any:
+    """Decode JSON, with orjson when installed.
+
+    :param content: JSON document
+    :return: Decoded data
+    :raises ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for content that is already plain data, encoded once and without validation."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
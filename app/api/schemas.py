@@ -1,10 +1,14 @@
+from enum import StrEnum
+
 from pydantic import BaseModel, Field
 
 
 class PageInfo(BaseModel):
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     page_size: int
+    next: str | None = Field(None, description="Cursor of the next page")
+    prev: str | None = Field(None, description="Cursor of the previous page")
 
 
 class ErrorMessage(BaseModel):
@@ -22,5 +26,30 @@ class ResponseModel[T](BaseModel):
 
 
 class PageParams(BaseModel):
-    page: int = Field(1, ge=1, description="Page number (starts at 1)")
+    page: int = Field(1, ge=1, description="Page number (starts at 1), ignored when a cursor is given")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: str | None = Field(None, description="Opaque cursor from a previous page's next/prev")
+    include_total: bool = Field(True, description="Whether to return the total number of items")
+    sort: str = Field("id", description="Field to sort by, prefixed with - for descending order")
+    filters: dict[str, str] = Field(
+        default_factory=dict, description="Filters as field[__operator] -> value, see app.repository.filters"
+    )
+
+    @property
+    def use_cursor(self) -> bool:
+        """Whether the page is read by keyset; the first page always is, so it returns a next cursor."""
+        return self.cursor is not None or self.page == 1
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportParams(BaseModel):
+    format: ExportFormat = Field(ExportFormat.NDJSON, description="File format, one row per line")
+    gzip: bool = Field(False, description="Whether to gzip the file on the fly")
+    sort: str = Field("id", description="Field to sort by, prefixed with - for descending order")
+    filters: dict[str, str] = Field(
+        default_factory=dict, description="Filters as field[__operator] -> value, see app.repository.filters"
+    )
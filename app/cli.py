@@ -0,0 +1,200 @@
+"""Command line tasks.
+
+Usage: ``python -m app.cli <command> [options]``.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.core.db import AsyncSessionLocal
+from app.core.settings import settings
+from app.libs import PAGE_SPECS, ImageDownloader, available_extractors, page_cache, page_fetcher
+from app.service import CardService, PokedexService
+
+
+async def sync_images(args: argparse.Namespace) -> None:
+    """Download the image of every card into the images directory."""
+    try:
+        async with (
+            AsyncSessionLocal() as session,
+            ImageDownloader(args.directory, concurrency=args.concurrency) as downloader,
+        ):
+            totals = await CardService(session=session).sync_images(downloader=downloader, batch_size=args.batch_size)
+    finally:
+        await page_fetcher.stop()
+
+    print(", ".join(f"{outcome}: {count}" for outcome, count in sorted(totals.items())) or "No cards.")
+
+
+async def sync_editions(args: argparse.Namespace) -> None:
+    """Crawl and upsert every card of the given editions."""
+    try:
+        for code in args.codes:
+            async with AsyncSessionLocal() as session:
+                edition, totals = await CardService(session=session).sync_edition(
+                    edition_slug=code, batch_size=args.batch_size
+                )
+            print(f"{edition}: " + ", ".join(f"{outcome}: {count}" for outcome, count in sorted(totals.items())))
+    finally:
+        await page_fetcher.stop()
+
+
+async def import_cards(args: argparse.Namespace) -> None:
+    """Import cards from an NDJSON or CSV file, printing the progress of each batch and the failed rows."""
+    from app.api.export import decode_rows
+    from app.api.schemas import ExportFormat
+
+    try:
+        format = ExportFormat(args.format or args.path.suffix.lstrip(".").lower())
+    except ValueError:
+        sys.exit(f"Unknown format of {args.path}, pass --format.")
+
+    async def chunks() -> AsyncIterator[bytes]:
+        with args.path.open("rb") as file:
+            while chunk := await asyncio.to_thread(file.read, 1024 * 1024):
+                yield chunk
+
+    totals = {}
+    try:
+        async with AsyncSessionLocal() as session:
+            service = CardService(session=session)
+            rows = decode_rows(chunks(), format)
+            async for totals, errors in service.import_cards(rows=rows, batch_size=args.batch_size):
+                for line, error in errors:
+                    print(f"{args.path}:{line}: {error}", file=sys.stderr)
+                print(", ".join(f"{outcome}: {count}" for outcome, count in sorted(totals.items())), flush=True)
+    finally:
+        await page_fetcher.stop()
+
+    print("Done." if totals else "No rows.")
+
+
+async def rebuild_stats(args: argparse.Namespace) -> None:  # noqa: ARG001
+    """Recompute the completion statistics of every pokedex."""
+    async with AsyncSessionLocal() as session:
+        pokedexes, editions = await PokedexService(session=session).rebuild_stats()
+    print(f"Rebuilt {pokedexes} pokedex and {editions} edition statistics rows.")
+
+
+async def bench_extract(args: argparse.Namespace) -> None:
+    """Compare the parse time and memory of every extractor backend on saved pages."""
+    spec = PAGE_SPECS[args.spec]
+    if args.from_cache:
+        pages = [html for _, html in page_cache.entries()]
+    else:
+        fixtures = args.fixtures or sorted(Path("benchmarks/fixtures").glob(f"{args.spec}_*.html"))
+        pages = [path.read_text() for path in fixtures]
+    if not pages:
+        print("No pages.")
+        return
+
+    print(f"{len(pages)} page(s), {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB on average, {args.rounds} rounds")
+    print(f"{'backend':<28}{'ms/page':>10}{'peak KiB':>10}  same fields")
+    baseline = None
+    for extractor in available_extractors():
+        values = [extractor.extract(html, spec) for html in pages]
+        baseline = baseline or values
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for html in pages:
+                extractor.extract(html, spec)
+        elapsed = (time.perf_counter() - start) / (args.rounds * len(pages))
+
+        tracemalloc.start()
+        for html in pages:
+            extractor.extract(html, spec)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{extractor.name:<28}{elapsed * 1000:>10.2f}{peak / 1024:>10.0f}  {values == baseline}")
+
+
+async def bench_serialize(args: argparse.Namespace) -> None:
+    """Compare the per-item cost of the model and fast serialization paths of GET /cards."""
+    from fastapi.routing import serialize_response
+
+    from app.api.endpoints.cards_api import router
+    from app.api.helper import ok, ok_rows
+    from app.api.schemas import PageInfo
+    from app.domain.models import Card, Edition
+    from app.domain.schemas import CardResponse
+
+    route = next(r for r in router.routes if r.name == "list_cards")
+    edition = Edition(id=1, code="BS", name="Base Set", year="1999")
+    cards = [
+        Card(id=i, card_id=str(i), set_id="102", name=f"Card {i}", rarity="Rare", edition_id=1, edition=edition)
+        for i in range(args.page_size)
+    ]
+    metadata = PageInfo(total=10_000, page=1, page_size=args.page_size, next="eyJrIjpbMTAwXX0")
+
+    async def model_path() -> bytes:
+        # What the endpoint did before: a model per card, wrapped, then validated and dumped by FastAPI
+        content = ok(data=[CardResponse.from_model(card) for card in cards], metadata=metadata)
+        return await serialize_response(field=route.response_field, response_content=content, dump_json=True)
+
+    async def fast_path() -> bytes:
+        return ok_rows([CardResponse.to_row(card) for card in cards], metadata=metadata).body
+
+    print(f"page_size={args.page_size}, {args.rounds} rounds, same JSON: ", end="")
+    print(json.loads(await model_path()) == json.loads(await fast_path()))
+    for name, path in (("model", model_path), ("fast", fast_path)):
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await path()
+        elapsed = (time.perf_counter() - start) / args.rounds
+        print(f"{name:<8}{elapsed * 1000:>8.3f} ms/page{elapsed * 1e6 / args.page_size:>8.2f} µs/item")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Pokémon catalog tasks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    images = commands.add_parser("sync-images", help="Download the image of every card.")
+    images.add_argument("--directory", default=settings.images_dir)
+    images.add_argument("--concurrency", type=int, default=settings.image_download_concurrency)
+    images.add_argument("--batch-size", type=int, default=200)
+    images.set_defaults(handler=sync_images)
+
+    editions = commands.add_parser("sync-edition", help="Crawl and upsert every card of editions.")
+    editions.add_argument("codes", nargs="+", metavar="code")
+    editions.add_argument("--batch-size", type=int, default=500)
+    editions.set_defaults(handler=sync_editions)
+
+    imports = commands.add_parser("import-cards", help="Import cards from an NDJSON or CSV file.")
+    imports.add_argument("path", type=Path)
+    imports.add_argument("--format", choices=["ndjson", "csv"], help="Defaults to the extension of the file.")
+    imports.add_argument("--batch-size", type=int, default=1000)
+    imports.set_defaults(handler=import_cards)
+
+    stats = commands.add_parser("rebuild-stats", help="Recompute the completion statistics of every pokedex.")
+    stats.set_defaults(handler=rebuild_stats)
+
+    bench = commands.add_parser("bench-extract", help="Benchmark the HTML extractor backends on saved pages.")
+    bench.add_argument("fixtures", nargs="*", type=Path, help="Defaults to benchmarks/fixtures/<spec>_*.html")
+    bench.add_argument("--spec", choices=sorted(PAGE_SPECS), default="card")
+    bench.add_argument("--from-cache", action="store_true", help="Use the pages in the page cache instead.")
+    bench.add_argument("--rounds", type=int, default=20)
+    bench.set_defaults(handler=bench_extract)
+
+    serialize = commands.add_parser("bench-serialize", help="Benchmark the serialization of GET /cards pages.")
+    serialize.add_argument("--page-size", type=int, default=100)
+    serialize.add_argument("--rounds", type=int, default=500)
+    serialize.set_defaults(handler=bench_serialize)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
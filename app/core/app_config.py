@@ -1,25 +1,38 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.libs import page_fetcher
+from app.service import job_worker_pool
+
 from .db import Model, engine
+from .migrations import migrate
+from .settings import settings
+
+# Logged through uvicorn so startup lines show up with its default logging config
+logger = logging.getLogger("uvicorn.error")
 
 
 def init_models() -> None:
-    """Initialize the database models by dropping and recreating all tables.
+    """Initialize the database models, creating missing tables and applying pending migrations.
 
-    This function uses the SQLAlchemy engine to drop all tables defined in Model.metadata
-    and then recreates them. Intended for development and testing purposes.
+    This function uses the SQLAlchemy engine to create the tables defined in Model.metadata
+    that do not exist yet, then brings existing tables up to date with the versioned
+    migrations in app.core.migrations.
     """
     Model.metadata.create_all(engine)
+    migrate(engine)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: ANN201, ARG001
     """FastAPI lifespan event handler.
 
-    Initializes the database tables at application startup.
+    Initializes the database tables and starts the shared page fetcher (HTTP
+    client and scraping browser) and the background job workers at
+    application startup, stopping them on shutdown.
 
     Parameters
     ----------
@@ -31,8 +44,13 @@ async def lifespan(app: FastAPI):  # noqa: ANN201, ARG001
     None
 
     """
+    logger.info("Database: %s", settings.describe_database())
     init_models()
+    await page_fetcher.start()
+    await job_worker_pool.start()
     yield
+    await job_worker_pool.stop()
+    await page_fetcher.stop()
 
 
 app = FastAPI(
@@ -1,13 +1,65 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Field, Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-engine = create_engine(url="sqlite:///./pokemon.db", echo=True)
+from .settings import Settings, settings
+from .versions import table_versions
+
+
+def engine_options(config: Settings) -> dict:
+    """Keyword arguments for create_engine/create_async_engine from the settings."""
+    options = {"echo": config.database_echo, "pool_pre_ping": config.database_pool_pre_ping}
+
+    # In-memory SQLite uses a single connection pool that takes no sizing
+    if config.is_sqlite and make_url(config.database_url).database in (None, "", ":memory:"):
+        return options
+
+    return options | {
+        "pool_size": config.database_pool_size,
+        "max_overflow": config.database_max_overflow,
+        "pool_timeout": config.database_pool_timeout,
+        "pool_recycle": config.database_pool_recycle,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ANN001, ARG001
+    """Tune every new SQLite connection according to the settings."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    cursor.close()
+
+
+# Sync engine: DDL, migrations and scripts
+engine = create_engine(settings.sync_database_url, **engine_options(settings))
 SessionLocal = sessionmaker(class_=Session, autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: request handling
+async_engine = create_async_engine(settings.async_database_url, **engine_options(settings))
+
+if settings.is_sqlite:
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False, bind=async_engine)
+
+if settings.is_sqlite:
+    # Versions are bumped by triggers of the database, so the writes of every process are seen
+    table_versions.persist(async_engine)
+else:
+    # Every session (AsyncSession runs on a sync one) bumps the versions of the tables it commits writes to
+    table_versions.track(Session)
+
 
 def get_session() -> Generator:
     session = SessionLocal()
@@ -17,8 +69,14 @@ def get_session() -> Generator:
         session.close()
 
 
+async def get_async_session() -> AsyncGenerator:
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 # Criar uma dependência reutilizável
 DbSession = Annotated[Session, Depends(get_session)]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_session)]
 
 
 class Model(SQLModel, table=False):
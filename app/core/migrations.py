@@ -0,0 +1,328 @@
+"""Versioned schema migrations.
+
+``Model.metadata.create_all`` only creates missing tables, so changes to
+existing tables (new indexes, constraints, columns) are applied here. Each
+migration runs once, in its own transaction, and the applied versions are
+recorded in the ``schema_version`` table. Migrations must be idempotent
+against a database freshly created by ``create_all``.
+
+Run pending migrations with ``python -m app.core.migrations``.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import NamedTuple
+
+from sqlalchemy import Connection, Engine, text
+
+from app.core.versions import VERSIONED_TABLES
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _merge_duplicates(conn: Connection, table: str, key: str, references: list[tuple[str, str, str | None]]) -> None:
+    """Keep the lowest id of each group of rows sharing a key, repointing references to it.
+
+    :param conn: Connection in the migration transaction
+    :param table: Table holding the duplicated rows
+    :param key: Comma separated columns that must be unique
+    :param references: (table, column, partner) triples referencing the duplicated rows, where
+        partner is the other column of a composite primary key, whose rows already pointing to
+        the kept row are dropped instead of repointed
+    """
+    groups = conn.execute(text(f"SELECT MIN(id), {key} FROM {table} GROUP BY {key} HAVING COUNT(*) > 1")).all()
+    columns = [column.strip() for column in key.split(",")]
+
+    for keep_id, *values in groups:
+        where = " AND ".join(f"{column} = :{column}" for column in columns)
+        params = dict(zip(columns, values, strict=True))
+        duplicates = conn.execute(
+            text(f"SELECT id FROM {table} WHERE {where} AND id <> :keep"),
+            {**params, "keep": keep_id},
+        ).scalars()
+
+        for duplicate_id in duplicates.all():
+            for ref_table, ref_column, partner in references:
+                if partner:
+                    conn.execute(
+                        text(
+                            f"DELETE FROM {ref_table} WHERE {ref_column} = :duplicate AND {partner} IN "
+                            f"(SELECT {partner} FROM {ref_table} WHERE {ref_column} = :keep)"
+                        ),
+                        {"keep": keep_id, "duplicate": duplicate_id},
+                    )
+                conn.execute(
+                    text(f"UPDATE {ref_table} SET {ref_column} = :keep WHERE {ref_column} = :duplicate"),
+                    {"keep": keep_id, "duplicate": duplicate_id},
+                )
+            conn.execute(text(f"DELETE FROM {table} WHERE id = :id"), {"id": duplicate_id})
+
+
+def _0001_lookup_indexes(conn: Connection) -> None:
+    """Unique indexes for edition codes and card identifiers, and reverse index of pokedex entries."""
+    _merge_duplicates(conn, "edition", "code", [("card", "edition_id", None)])
+    _merge_duplicates(conn, "card", "edition_id, card_id, set_id", [("pokedexentry", "card_id", "pokedex_id")])
+
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_edition_code ON edition (code)"))
+    conn.execute(
+        text("CREATE UNIQUE INDEX IF NOT EXISTS uq_card_edition_card_set ON card (edition_id, card_id, set_id)")
+    )
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_pokedexentry_card_id ON pokedexentry (card_id)"))
+
+
+# Text of a card indexed for search: its own name and rarity, and the name and code of its edition
+CARD_SEARCH_ROW = """
+    SELECT card.id, card.name, card.rarity, edition.name, edition.code
+    FROM card JOIN edition ON edition.id = card.edition_id
+"""
+
+
+def _0002_card_search(conn: Connection) -> None:
+    """Full-text index of cards, kept in sync with cards and editions by triggers (SQLite only)."""
+    if conn.dialect.name != "sqlite":
+        # Other backends search with LIKE, see CardRepository.search
+        return
+
+    # rowid is the card id; prefix indexes make 2 and 3 character typeahead queries index lookups too
+    conn.execute(
+        text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS card_search USING fts5("
+            "name, rarity, edition_name, edition_code, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    )
+    conn.execute(
+        text(f"""
+            CREATE TRIGGER IF NOT EXISTS card_search_insert AFTER INSERT ON card BEGIN
+                INSERT INTO card_search (rowid, name, rarity, edition_name, edition_code)
+                {CARD_SEARCH_ROW} WHERE card.id = new.id;
+            END
+        """)
+    )
+    conn.execute(
+        text(f"""
+            CREATE TRIGGER IF NOT EXISTS card_search_update AFTER UPDATE OF name, rarity, edition_id ON card BEGIN
+                DELETE FROM card_search WHERE rowid = old.id;
+                INSERT INTO card_search (rowid, name, rarity, edition_name, edition_code)
+                {CARD_SEARCH_ROW} WHERE card.id = new.id;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS card_search_delete AFTER DELETE ON card BEGIN
+                DELETE FROM card_search WHERE rowid = old.id;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS card_search_edition_update AFTER UPDATE OF name, code ON edition BEGIN
+                UPDATE card_search SET edition_name = new.name, edition_code = new.code
+                WHERE rowid IN (SELECT id FROM card WHERE edition_id = new.id);
+            END
+        """)
+    )
+
+    conn.execute(text("DELETE FROM card_search"))
+    conn.execute(text(f"INSERT INTO card_search (rowid, name, rarity, edition_name, edition_code) {CARD_SEARCH_ROW}"))
+
+
+def _0003_filter_indexes(conn: Connection) -> None:
+    """Indexes of the fields listings can be filtered and sorted by."""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_card_name ON card (name)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_card_rarity ON card (rarity)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_edition_name ON edition (name)"))
+
+
+# Completion statistics, from scratch: cards owned by each pokedex and cards of each edition, by rarity
+POKEDEX_STATS_ROWS = """
+    SELECT pokedexentry.pokedex_id, card.edition_id, card.rarity, COUNT(*)
+    FROM pokedexentry JOIN card ON card.id = pokedexentry.card_id
+    GROUP BY pokedexentry.pokedex_id, card.edition_id, card.rarity
+"""
+EDITION_STATS_ROWS = "SELECT edition_id, rarity, COUNT(*) FROM card GROUP BY edition_id, rarity"
+
+
+def rebuild_pokedex_stats(conn: Connection) -> tuple[int, int]:
+    """Recompute the completion statistics tables from the cards and pokedex entries (SQLite only).
+
+    :param conn: Connection in the rebuild transaction
+    :return: Number of pokedex and edition statistics rows written
+    """
+    conn.execute(text("DELETE FROM pokedex_stats"))
+    pokedexes = conn.execute(
+        text(f"INSERT INTO pokedex_stats (pokedex_id, edition_id, rarity, owned) {POKEDEX_STATS_ROWS}")
+    )
+    conn.execute(text("DELETE FROM edition_stats"))
+    editions = conn.execute(text(f"INSERT INTO edition_stats (edition_id, rarity, cards) {EDITION_STATS_ROWS}"))
+    return pokedexes.rowcount, editions.rowcount
+
+
+def _0004_pokedex_stats(conn: Connection) -> None:
+    """Completion statistics of pokedexes by edition and rarity, kept up to date by triggers (SQLite only)."""
+    if conn.dialect.name != "sqlite":
+        # Other backends aggregate on read, see PokedexRepository.get_stats
+        return
+
+    conn.execute(
+        text("""
+            CREATE TABLE IF NOT EXISTS pokedex_stats (
+                pokedex_id INTEGER NOT NULL, edition_id INTEGER NOT NULL, rarity TEXT NOT NULL, owned INTEGER NOT NULL,
+                PRIMARY KEY (pokedex_id, edition_id, rarity)
+            ) WITHOUT ROWID
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TABLE IF NOT EXISTS edition_stats (
+                edition_id INTEGER NOT NULL, rarity TEXT NOT NULL, cards INTEGER NOT NULL,
+                PRIMARY KEY (edition_id, rarity)
+            ) WITHOUT ROWID
+        """)
+    )
+
+    # Counters are moved by one per row written, and rows dropping to zero are removed
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS pokedex_stats_entry_insert AFTER INSERT ON pokedexentry BEGIN
+                INSERT INTO pokedex_stats (pokedex_id, edition_id, rarity, owned)
+                SELECT new.pokedex_id, edition_id, rarity, 1 FROM card WHERE id = new.card_id
+                ON CONFLICT (pokedex_id, edition_id, rarity) DO UPDATE SET owned = owned + 1;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS pokedex_stats_entry_delete AFTER DELETE ON pokedexentry BEGIN
+                UPDATE pokedex_stats SET owned = owned - 1
+                WHERE pokedex_id = old.pokedex_id
+                AND (edition_id, rarity) = (SELECT edition_id, rarity FROM card WHERE id = old.card_id);
+                DELETE FROM pokedex_stats WHERE pokedex_id = old.pokedex_id AND owned <= 0;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS pokedex_stats_card_insert AFTER INSERT ON card BEGIN
+                INSERT INTO edition_stats (edition_id, rarity, cards) VALUES (new.edition_id, new.rarity, 1)
+                ON CONFLICT (edition_id, rarity) DO UPDATE SET cards = cards + 1;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS pokedex_stats_card_update AFTER UPDATE OF edition_id, rarity ON card
+            WHEN old.edition_id IS NOT new.edition_id OR old.rarity IS NOT new.rarity BEGIN
+                UPDATE edition_stats SET cards = cards - 1 WHERE edition_id = old.edition_id AND rarity = old.rarity;
+                DELETE FROM edition_stats WHERE edition_id = old.edition_id AND rarity = old.rarity AND cards <= 0;
+                INSERT INTO edition_stats (edition_id, rarity, cards) VALUES (new.edition_id, new.rarity, 1)
+                ON CONFLICT (edition_id, rarity) DO UPDATE SET cards = cards + 1;
+
+                UPDATE pokedex_stats SET owned = owned - 1
+                WHERE edition_id = old.edition_id AND rarity = old.rarity
+                AND pokedex_id IN (SELECT pokedex_id FROM pokedexentry WHERE card_id = new.id);
+                DELETE FROM pokedex_stats WHERE edition_id = old.edition_id AND rarity = old.rarity AND owned <= 0;
+                INSERT INTO pokedex_stats (pokedex_id, edition_id, rarity, owned)
+                SELECT pokedex_id, new.edition_id, new.rarity, 1 FROM pokedexentry WHERE card_id = new.id
+                ON CONFLICT (pokedex_id, edition_id, rarity) DO UPDATE SET owned = owned + 1;
+            END
+        """)
+    )
+    conn.execute(
+        text("""
+            CREATE TRIGGER IF NOT EXISTS pokedex_stats_card_delete AFTER DELETE ON card BEGIN
+                UPDATE edition_stats SET cards = cards - 1 WHERE edition_id = old.edition_id AND rarity = old.rarity;
+                DELETE FROM edition_stats WHERE edition_id = old.edition_id AND rarity = old.rarity AND cards <= 0;
+
+                UPDATE pokedex_stats SET owned = owned - 1
+                WHERE edition_id = old.edition_id AND rarity = old.rarity
+                AND pokedex_id IN (SELECT pokedex_id FROM pokedexentry WHERE card_id = old.id);
+                DELETE FROM pokedex_stats WHERE edition_id = old.edition_id AND rarity = old.rarity AND owned <= 0;
+            END
+        """)
+    )
+
+    rebuild_pokedex_stats(conn)
+
+
+def _0005_table_versions(conn: Connection) -> None:
+    """Version counters of the tables cached responses are read from, bumped by triggers (SQLite only)."""
+    if conn.dialect.name != "sqlite":
+        # Other backends keep the versions in memory, see TableVersions
+        return
+
+    conn.execute(
+        text("CREATE TABLE IF NOT EXISTS table_version (name TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID")
+    )
+    for table in VERSIONED_TABLES:
+        # Random starting versions keep a recreated database from repeating the ETags of the previous one
+        conn.execute(
+            text("INSERT OR IGNORE INTO table_version (name, version) VALUES (:name, random() & 1073741823)"),
+            {"name": table},
+        )
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                text(f"""
+                    CREATE TRIGGER IF NOT EXISTS table_version_{table}_{operation.lower()} AFTER {operation} ON {table}
+                    BEGIN
+                        UPDATE table_version SET version = version + 1 WHERE name = '{table}';
+                    END
+                """)
+            )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "lookup indexes and uniqueness of editions and cards", _0001_lookup_indexes),
+    Migration(2, "full-text search index of cards", _0002_card_search),
+    Migration(3, "indexes of the filterable fields of cards and editions", _0003_filter_indexes),
+    Migration(4, "completion statistics of pokedexes", _0004_pokedex_stats),
+    Migration(5, "version counters of the cached tables", _0005_table_versions),
+]
+
+
+def current_version(conn: Connection) -> int:
+    """Return the latest applied migration version, 0 when none was applied."""
+    conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, description TEXT)"))
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar_one()
+
+
+def migrate(engine: Engine) -> int:
+    """Apply every pending migration, in order.
+
+    :param engine: Engine of the database to migrate
+    :return: The schema version after migrating
+    """
+    with engine.begin() as conn:
+        version = current_version(conn)
+
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+
+        version = migration.version
+        logger.info("Applied migration %04d: %s", migration.version, migration.description)
+
+    return version
+
+
+if __name__ == "__main__":
+    import app.domain.models  # noqa: F401  (registers the tables in Model.metadata)
+    from app.core.db import Model, engine
+
+    logging.basicConfig(level=logging.INFO)
+    Model.metadata.create_all(engine)
+    print(f"Schema version: {migrate(engine)}")
@@ -0,0 +1,137 @@
+from typing import Any, Literal
+
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
+
+# Defaults of each profile; any setting given explicitly (env var, .env) wins over them
+PROFILES: dict[str, dict[str, Any]] = {
+    "development": {
+        "database_pool_size": 5,
+        "database_max_overflow": 5,
+        "sqlite_mmap_size": 64 * 1024 * 1024,
+        "sqlite_cache_size": -16_000,
+    },
+    "production": {
+        "database_pool_size": 20,
+        "database_max_overflow": 20,
+        "database_pool_pre_ping": True,
+        "sqlite_mmap_size": 1024 * 1024 * 1024,
+        "sqlite_cache_size": -256_000,
+    },
+}
+
+# Drivers used by each engine, by database backend; the PostgreSQL ones come with the "postgres" extra
+SYNC_DRIVERS = {"sqlite": "sqlite", "postgresql": "postgresql+psycopg"}
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+class Settings(BaseSettings):
+    """Application settings, read from ``POKEMON_*`` environment variables and ``.env``."""
+
+    model_config = SettingsConfigDict(env_prefix="POKEMON_", env_file=".env", extra="ignore")
+
+    profile: Literal["development", "production"] = "development"
+
+    database_url: str = "sqlite:///./pokemon.db"
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = False
+
+    # SQLite only, applied to every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000  # negative: KiB instead of pages
+    sqlite_busy_timeout: int = 5000  # ms
+
+    edition_cache_size: int = 1024
+    edition_cache_ttl: float = 300.0
+    count_cache_size: int = 1024  # listing totals, by entity and filters
+
+    images_dir: str = "images"
+    image_download_concurrency: int = 16
+    image_cache_max_age: int = 30 * 24 * 3600  # Cache-Control max-age of served images, in seconds
+
+    # HTTP response cache of the GET routes that opt in
+    response_cache_enabled: bool = True
+    response_cache_size: int = 512  # responses
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Outbound scraping, per host
+    scrape_rate: float = 2.0  # requests per second
+    scrape_burst: int = 4
+    scrape_max_concurrency: int = 8
+    scrape_retries: int = 3
+    scrape_backoff: float = 1.0  # upper bound of the first retry delay, doubled on each retry, in seconds
+    scrape_max_backoff: float = 30.0
+    scrape_failure_threshold: int = 5  # consecutive failures that open the circuit
+    scrape_reset_timeout: float = 30.0  # seconds the circuit stays open
+
+    # Background jobs
+    job_workers: int = 2
+    job_max_attempts: int = 5
+    job_retry_backoff: float = 30.0  # delay before the first retry, doubled on each attempt, in seconds
+    job_retry_max_delay: float = 3600.0
+    job_poll_interval: float = 2.0
+    job_lock_timeout: float = 600.0  # running jobs without a heartbeat for longer are considered orphaned
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_profile(cls, data: Any) -> Any:
+        """Fill the settings not given explicitly with the defaults of the selected profile."""
+        if isinstance(data, dict):
+            profile = data.get("profile", "development")
+            return {**PROFILES.get(profile, {}), **data}
+        return data
+
+    @property
+    def database_backend(self) -> str:
+        """Database backend of the URL (sqlite, postgresql...)."""
+        return make_url(self.database_url).get_backend_name()
+
+    @property
+    def is_sqlite(self) -> bool:
+        """Whether the database is SQLite."""
+        return self.database_backend == "sqlite"
+
+    def _database_url_for(self, drivers: dict[str, str]) -> str:
+        url = make_url(self.database_url)
+        drivername = drivers.get(url.get_backend_name(), url.drivername)
+        return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+    @property
+    def sync_database_url(self) -> str:
+        """Database URL with the driver of the sync engine."""
+        return self._database_url_for(SYNC_DRIVERS)
+
+    @property
+    def async_database_url(self) -> str:
+        """Database URL with the driver of the async engine."""
+        return self._database_url_for(ASYNC_DRIVERS)
+
+    def describe_database(self) -> str:
+        """One line summary of the database settings in effect, without credentials."""
+        parts = [
+            f"profile={self.profile}",
+            f"url={make_url(self.database_url).render_as_string(hide_password=True)}",
+            f"echo={self.database_echo}",
+            f"pool_size={self.database_pool_size}",
+            f"max_overflow={self.database_max_overflow}",
+            f"pool_pre_ping={self.database_pool_pre_ping}",
+        ]
+        if self.is_sqlite:
+            parts += [
+                f"journal_mode={self.sqlite_journal_mode}",
+                f"synchronous={self.sqlite_synchronous}",
+                f"mmap_size={self.sqlite_mmap_size}",
+                f"cache_size={self.sqlite_cache_size}",
+                f"busy_timeout={self.sqlite_busy_timeout}",
+            ]
+        return " ".join(parts)
+
+
+settings = Settings()
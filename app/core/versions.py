@@ -0,0 +1,110 @@
+import uuid
+from threading import Lock
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+# Tables whose versions are kept, the ones cached responses may be read from
+VERSIONED_TABLES = ("card", "edition", "pokedex", "pokedexentry")
+
+
+class TableVersions:
+    """Version counter of each table, bumped when a write to it commits.
+
+    On SQLite the counters live in the ``table_version`` table and are bumped
+    by triggers (see migration 0005), in the same transaction as the write,
+    so writes of every process are seen: CLI commands, other workers and raw
+    SQL alike. They are read with a single query per request.
+
+    Other backends fall back on counters kept in memory by ``track``: tables
+    written by a transaction are collected on flush (and on ORM bulk
+    INSERT/UPDATE/DELETE statements) and bumped only once it commits, so a
+    version never moves ahead of the data readers can see. This assumes a
+    single process writes to the database, as writes made by other
+    processes are not seen. The epoch changes on every start, so versions of
+    different runs never collide.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a TableVersions instance."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self._engine: AsyncEngine | None = None
+        self._versions: dict[str, int] = {}
+        self._lock = Lock()
+
+    def persist(self, engine: AsyncEngine) -> None:
+        """Read the versions from the ``table_version`` table of a database, kept by its triggers.
+
+        :param engine: Engine of the database
+        """
+        self._engine = engine
+
+    async def read(self, *tables: str) -> str:
+        """Return a token of the current versions of tables, which changes whenever any of them is written.
+
+        :param tables: Table names
+        :return: The versions, joined
+        """
+        if self._engine is None:
+            return f"{self.epoch}:{'.'.join(map(str, self.get(*tables)))}"
+
+        async with self._engine.connect() as conn:
+            versions = dict((await conn.execute(text("SELECT name, version FROM table_version"))).all())
+        return ".".join(str(versions.get(table, 0)) for table in tables)
+
+    def get(self, *tables: str) -> tuple[int, ...]:
+        """Return the current in-memory version of each table.
+
+        :param tables: Table names
+        :return: Versions, in the same order as the tables
+        """
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables: str) -> None:
+        """Increment the version of tables.
+
+        :param tables: Table names
+        """
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def track(self, session_class: type[Session] = Session) -> None:
+        """Listen to the sessions of a class, bumping the tables written by each committed transaction.
+
+        :param session_class: Session class to listen to; AsyncSession runs on its sync Session
+        """
+        event.listen(session_class, "after_flush", self._after_flush)
+        event.listen(session_class, "do_orm_execute", self._on_execute)
+        event.listen(session_class, "after_commit", self._after_commit)
+        event.listen(session_class, "after_rollback", self._after_rollback)
+
+    @staticmethod
+    def _written(session: Session) -> set[str]:
+        return session.info.setdefault("written_tables", set())
+
+    def _after_flush(self, session: Session, flush_context: UOWTransaction) -> None:  # noqa: ARG002
+        written = self._written(session)
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            table = getattr(instance, "__table__", None)
+            if table is not None:
+                written.add(table.name)
+
+    def _on_execute(self, state: ORMExecuteState) -> None:
+        if state.is_insert or state.is_update or state.is_delete:
+            table = getattr(state.statement, "table", None)
+            if table is not None:
+                self._written(state.session).add(table.name)
+
+    def _after_commit(self, session: Session) -> None:
+        written = session.info.pop("written_tables", None)
+        if written:
+            self.bump(*written)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("written_tables", None)
+
+
+table_versions = TableVersions()
@@ -1,5 +1,5 @@
 """Module defining the models for Pokemon cards."""
 
-from .entities import Card, Edition, Pokedex
+from .entities import Card, Edition, Job, Pokedex, PokedexEntry
 
-__all__ = ["Card", "Edition", "Pokedex"]
+__all__ = ["Card", "Edition", "Job", "Pokedex", "PokedexEntry"]
@@ -1,12 +1,25 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import JSON, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.core.db import Model
 from app.domain.schemas.edition_schema import EditionLoad
+from app.domain.schemas.job_schema import JobStatus
+
+
+def utcnow() -> datetime:
+    """Current time, in UTC."""
+    return datetime.now(UTC)
 
 
 class PokedexEntry(SQLModel, table=True):
     """Class representing an entry in a Pokedex."""
 
+    # The primary key serves lookups by pokedex; this one serves lookups by card
+    __table_args__ = (Index("ix_pokedexentry_card_id", "card_id"),)
+
     pokedex_id: int | None = Field(default=None, foreign_key="pokedex.id", primary_key=True)
     card_id: int | None = Field(default=None, foreign_key="card.id", primary_key=True)
 
@@ -14,8 +27,8 @@ class PokedexEntry(SQLModel, table=True):
 class Edition(Model, table=True):
     """Class representing a Pokemon card edition."""
 
-    name: str
-    code: str
+    name: str = Field(index=True)
+    code: str = Field(index=True, unique=True)
     year: str
 
     cards: list["Card"] = Relationship(back_populates="edition")
@@ -51,10 +64,13 @@ class Edition(Model, table=True):
 class Card(Model, table=True):
     """Class representing a Pokemon card."""
 
+    # Natural key of a card; edition_id leads so it also serves listings of an edition
+    __table_args__ = (Index("uq_card_edition_card_set", "edition_id", "card_id", "set_id", unique=True),)
+
     card_id: str
     set_id: str
-    name: str
-    rarity: str
+    name: str = Field(index=True)
+    rarity: str = Field(index=True)
 
     edition_id: int = Field(foreign_key="edition.id")
     edition: "Edition" = Relationship(back_populates="cards")
@@ -97,3 +113,31 @@ class Pokedex(Model, table=True):
         :rtype: str
         """
         return f"Pokedex: {self.name}"
+
+
+class Job(Model, table=True):
+    """Class representing a background job."""
+
+    # Serves the claim of the next due job
+    __table_args__ = (Index("ix_job_status_run_after", "status", "run_after"),)
+
+    kind: str
+    payload: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+    attempts: int = 0
+    max_attempts: int = 5
+    run_after: datetime = Field(default_factory=utcnow)
+    locked_at: datetime | None = None
+    result: dict[str, Any] | None = Field(default=None, sa_type=JSON)
+    error: str | None = None
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+    def __str__(self) -> str:
+        """Return a string representation of the Job instance.
+
+        :param self: The job instance
+        :return: String representation of the job
+        :rtype: str
+        """
+        return f"Job {self.id} ({self.kind}): {self.status}"
@@ -1,12 +1,48 @@
 """Schemas for domain models."""
 
-from .card_schema import CardInput, CardLoad, CardResponse
-from .edition_schema import EditionLoad, EditionResponse
+from .card_schema import (
+    CardBulkInput,
+    CardBulkItemResult,
+    CardBulkReport,
+    CardBulkStatus,
+    CardImportError,
+    CardImportReport,
+    CardInput,
+    CardLoad,
+    CardResponse,
+)
+from .edition_schema import EditionLoad, EditionResponse, EditionSyncReport
+from .job_schema import JobResponse, JobStatus
+from .pokedex_scbema import (
+    EditionStats,
+    PokedexCardsInput,
+    PokedexCardsReport,
+    PokedexInput,
+    PokedexResponse,
+    PokedexStats,
+    RarityStats,
+)
 
 __all__ = [
+    "CardBulkInput",
+    "CardBulkItemResult",
+    "CardBulkReport",
+    "CardBulkStatus",
+    "CardImportError",
+    "CardImportReport",
     "CardInput",
     "CardLoad",
     "CardResponse",
     "EditionLoad",
     "EditionResponse",
+    "EditionStats",
+    "EditionSyncReport",
+    "JobResponse",
+    "JobStatus",
+    "PokedexCardsInput",
+    "PokedexCardsReport",
+    "PokedexInput",
+    "PokedexResponse",
+    "PokedexStats",
+    "RarityStats",
 ]
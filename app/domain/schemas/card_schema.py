@@ -1,6 +1,10 @@
-from pydantic import BaseModel, field_validator
+from enum import StrEnum
+from typing import TYPE_CHECKING
 
-from app.domain.models.entities import Card
+from pydantic import BaseModel, Field, field_validator
+
+if TYPE_CHECKING:
+    from app.domain.models.entities import Card
 
 
 class CardLoad(BaseModel):
@@ -12,6 +16,7 @@ class CardLoad(BaseModel):
     name: str
     rarity: str
     edition_code: str
+    edition_id: int | None = None
 
     @field_validator("name")
     @classmethod
@@ -33,6 +38,26 @@ class CardInput(BaseModel):
     set_id: str
     edition_slug: str
 
+    @property
+    def identifiers(self) -> tuple[str, str, str]:
+        """Natural key of the card: (card_id, set_id, edition_slug)."""
+        return self.card_id, self.set_id, self.edition_slug
+
+
+class CardBulkInput(BaseModel):
+    """Class representing an input schema for bulk card ingestion."""
+
+    items: list[CardInput] = Field(..., min_length=1, max_length=5000)
+
+
+class CardBulkStatus(StrEnum):
+    """Outcome of a single item in a bulk card ingestion."""
+
+    CREATED = "created"
+    EXISTING = "existing"
+    DUPLICATE = "duplicate"
+    FAILED = "failed"
+
 
 class CardResponse(BaseModel):
     """Class representing a response schema for Pokemon card."""
@@ -48,13 +73,60 @@ class CardResponse(BaseModel):
     model_config = {"from_attributes": True}
 
     @classmethod
-    def from_model(cls, card: Card) -> "CardResponse":
-        return cls(
-            id=card.id,
-            card_id=card.card_id,
-            set_id=card.set_id,
-            name=card.name,
-            rarity=card.rarity,
-            edition_code=card.edition.code,
-            edition_name=card.edition.name,
-        )
+    def from_model(cls, card: "Card") -> "CardResponse":
+        return cls(**cls.to_row(card))
+
+    @staticmethod
+    def to_row(card: "Card") -> dict:
+        """Fields of the response as a plain dict, for serializing lists without building models."""
+        return {
+            "id": card.id,
+            "card_id": card.card_id,
+            "set_id": card.set_id,
+            "name": card.name,
+            "rarity": card.rarity,
+            "edition_code": card.edition.code,
+            "edition_name": card.edition.name,
+        }
+
+
+class CardBulkItemResult(BaseModel):
+    """Class representing the result of one item in a bulk card ingestion."""
+
+    card_id: str
+    set_id: str
+    edition_slug: str
+    status: CardBulkStatus
+    card: CardResponse | None = None
+    error: str | None = None
+
+
+class CardBulkReport(BaseModel):
+    """Class representing the report of a bulk card ingestion."""
+
+    created: int = 0
+    existing: int = 0
+    duplicate: int = 0
+    failed: int = 0
+    items: list[CardBulkItemResult] = []
+
+
+class CardImportError(BaseModel):
+    """Class representing a row of an imported file that could not be imported."""
+
+    line: int
+    error: str
+
+
+class CardImportReport(BaseModel):
+    """Class representing the report of a card import."""
+
+    read: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicate: int = 0
+    scraped: int = 0
+    edition_lookups: int = Field(0, description="Rows with their own data scraped only to resolve their edition")
+    failed: int = 0
+    errors: list[CardImportError] = Field([], description="Rows that failed, the first ones only")
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, field_validator
+from typing import TYPE_CHECKING
 
-from app.domain.models.entities import Edition
+from pydantic import BaseModel, Field, field_validator
+
+if TYPE_CHECKING:
+    from app.domain.models.entities import Edition
 
 
 class EditionLoad(BaseModel):
@@ -34,10 +37,26 @@ class EditionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
     @classmethod
-    def from_model(cls, edition: Edition) -> "EditionResponse":
-        return cls(
-            id=edition.id,
-            code=edition.code,
-            name=edition.name,
-            year=edition.year,
-        )
+    def from_model(cls, edition: "Edition") -> "EditionResponse":
+        return cls(**cls.to_row(edition))
+
+    @staticmethod
+    def to_row(edition: "Edition") -> dict:
+        """Fields of the response as a plain dict, for serializing lists without building models."""
+        return {
+            "id": edition.id,
+            "code": edition.code,
+            "name": edition.name,
+            "year": edition.year,
+        }
+
+
+class EditionSyncReport(BaseModel):
+    """Class representing the outcome of crawling every card of an edition."""
+
+    edition: EditionResponse
+    listed: int = Field(0, description="Cards found on the listing pages")
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicate: int = 0
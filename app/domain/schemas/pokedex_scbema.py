@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+from typing import TYPE_CHECKING
 
-from app.domain.models import Pokedex
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from app.domain.models.entities import Pokedex
 
 
 class PokedexInput(BaseModel):
@@ -18,8 +21,50 @@ class PokedexResponse(BaseModel):
     model_config = {"from_attributes": True}
 
     @classmethod
-    def from_model(cls, pokedex: Pokedex) -> "PokedexResponse":
+    def from_model(cls, pokedex: "Pokedex") -> "PokedexResponse":
         return cls(
             id=pokedex.id,
             name=pokedex.name,
         )
+
+
+class PokedexCardsInput(BaseModel):
+    """Class representing the cards added to or removed from a pokedex at once."""
+
+    card_ids: list[int] = Field(..., min_length=1, max_length=10_000)
+
+
+class PokedexCardsReport(BaseModel):
+    """Class representing the outcome of adding or removing cards of a pokedex."""
+
+    requested: int = Field(0, description="Distinct card ids given")
+    added: int = 0
+    removed: int = 0
+    missing: list[int] = Field([], description="Ids of cards that do not exist, never added")
+
+
+class RarityStats(BaseModel):
+    """Class representing the completion of a pokedex for one rarity of an edition."""
+
+    rarity: str
+    owned: int
+    total: int
+
+
+class EditionStats(BaseModel):
+    """Class representing the completion of a pokedex for one edition."""
+
+    edition_id: int
+    edition_code: str
+    edition_name: str
+    owned: int
+    total: int
+    rarities: list[RarityStats] = []
+
+
+class PokedexStats(BaseModel):
+    """Class representing the completion of a pokedex, by edition and rarity."""
+
+    pokedex_id: int
+    owned: int = 0
+    editions: list[EditionStats] = Field([], description="Editions the pokedex has at least one card of")
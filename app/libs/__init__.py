@@ -1,5 +1,43 @@
 """Libs package initialization."""
 
-from .ligapokemon import LigaPokemon
+from .cache import PageCache, page_cache
+from .engine import ScrapeEngine, scrape_engine
+from .exceptions import (
+    CircuitOpenError,
+    EditionNotFoundError,
+    PageNotCachedError,
+    PageNotFoundError,
+    TransientFetchError,
+)
+from .extract import Extractor, LexborExtractor, PageSpec, Selector, SoupExtractor, available_extractors
+from .fetcher import PageFetcher, page_fetcher
+from .images import ImageDownloader, ImageSize, ImageVariants
+from .ligapokemon import PAGE_SPECS, LigaPokemon
+from .throttle import CircuitBreaker, HostThrottle
 
-__all__ = ["LigaPokemon"]
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "EditionNotFoundError",
+    "Extractor",
+    "HostThrottle",
+    "ImageDownloader",
+    "ImageSize",
+    "ImageVariants",
+    "LexborExtractor",
+    "LigaPokemon",
+    "PAGE_SPECS",
+    "PageCache",
+    "PageFetcher",
+    "PageNotCachedError",
+    "PageNotFoundError",
+    "PageSpec",
+    "ScrapeEngine",
+    "Selector",
+    "SoupExtractor",
+    "TransientFetchError",
+    "available_extractors",
+    "page_cache",
+    "page_fetcher",
+    "scrape_engine",
+]
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent addresses share a cache entry.
+
+    The scheme and host are lowercased, query parameters are sorted and the
+    fragment is dropped.
+
+    :param url: The URL to normalize
+    :type url: str
+    :return: Normalized URL
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class PageCache:
+    """Persistent cache of fetched HTML pages.
+
+    Each page is stored zlib-compressed in its own file, named after the hash
+    of its normalized URL, with the URL on the first line so entries can be
+    re-parsed offline. The file modification time is the store time, used
+    for the TTL, and the access time is refreshed on every hit, so the least
+    recently used pages are evicted first once the cache outgrows its size.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = ".cache/pages",
+        *,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        compress_level: int = 6,
+    ) -> None:
+        """Initialize a PageCache instance.
+
+        :param directory: Directory where pages are stored
+        :type directory: str | Path
+        :param ttl: Seconds a page is served before it must be fetched again
+        :type ttl: float
+        :param max_bytes: Size of the cache on disk above which pages are evicted
+        :type max_bytes: int
+        :param compress_level: zlib compression level
+        :type compress_level: int
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size: int | None = None
+
+    def _path(self, url: str) -> Path:
+        """Return the file path of a URL's entry."""
+        key = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return self.directory / key[:2] / f"{key}.html.z"
+
+    def _files(self) -> Iterator[Path]:
+        """Iterate over every entry file."""
+        if self.directory.exists():
+            yield from self.directory.glob("*/*.html.z")
+
+    @property
+    def size(self) -> int:
+        """Bytes used by the entries on disk."""
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self._files())
+        return self._size
+
+    @staticmethod
+    def _decode(blob: bytes) -> tuple[str, str]:
+        """Split an entry into its URL and HTML."""
+        url, _, html = zlib.decompress(blob).decode().partition("\n")
+        return url, html
+
+    def get(self, url: str, *, allow_stale: bool = False) -> str | None:
+        """Return the cached HTML of a URL.
+
+        :param url: The URL to look up
+        :type url: str
+        :param allow_stale: Whether to serve the page even past its TTL
+        :type allow_stale: bool
+        :return: The cached HTML, or None when missing or expired
+        :rtype: str | None
+        """
+        path = self._path(url)
+        try:
+            stat = path.stat()
+            if not allow_stale and time.time() - stat.st_mtime > self.ttl:
+                self.expired += 1
+                self.misses += 1
+                return None
+            _, html = self._decode(path.read_bytes())
+        except (OSError, zlib.error, UnicodeDecodeError):
+            self.misses += 1
+            return None
+
+        os.utime(path, (time.time(), stat.st_mtime))
+        self.hits += 1
+        return html
+
+    def put(self, url: str, html: str) -> None:
+        """Store the HTML of a URL, evicting old pages when over size.
+
+        :param url: The URL of the page
+        :type url: str
+        :param html: The page HTML
+        :type html: str
+        """
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        blob = zlib.compress(f"{normalize_url(url)}\n{html}".encode(), self.compress_level)
+        previous = path.stat().st_size if path.exists() else 0
+
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(path)
+
+        self._size = self.size - previous + len(blob)
+        self.stores += 1
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target: float = 0.9) -> None:
+        """Remove the least recently used pages until the cache fits its budget.
+
+        :param target: Fraction of the maximum size to shrink down to
+        :type target: float
+        """
+        entries = []
+        for path in self._files():
+            stat = path.stat()
+            entries.append((stat.st_atime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        limit = self.max_bytes * target
+        for _, file_size, path in entries:
+            if size <= limit:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+            self.evictions += 1
+
+        self._size = size
+
+    def invalidate(self, url: str) -> None:
+        """Remove the entry of a URL.
+
+        :param url: The URL to remove
+        :type url: str
+        """
+        path = self._path(url)
+        if path.exists():
+            self._size = self.size - path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def entries(self) -> Iterator[tuple[str, str]]:
+        """Iterate over every cached page, regardless of its age.
+
+        Useful to re-parse stored pages offline after the selectors change.
+
+        :return: Iterator of (url, html) tuples
+        :rtype: Iterator[tuple[str, str]]
+        """
+        for path in self._files():
+            try:
+                yield self._decode(path.read_bytes())
+            except (OSError, zlib.error, UnicodeDecodeError):
+                continue
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Return the cache counters.
+
+        :return: Hit, miss, store and eviction counters, hit rate and size
+        :rtype: dict[str, int | float]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.size,
+        }
+
+
+page_cache = PageCache()
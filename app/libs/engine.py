@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from email.utils import parsedate_to_datetime
+
+from playwright.async_api import Browser, Page, Playwright, Route, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .exceptions import PageNotFoundError, TransientFetchError
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait according to a Retry-After header, None when absent.
+
+    :param headers: Response headers, with lowercase names
+    :type headers: Mapping[str, str]
+    :return: Seconds to wait
+    :rtype: float | None
+    """
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ScrapeEngine:
+    """Long-lived headless browser shared by every scraper in the application.
+
+    A single Chromium instance is launched once and a bounded pool of isolated
+    browser contexts (one page each) is reused across requests, so concurrent
+    scrapes never pay for a cold browser start.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        headless: bool = True,
+        blocked_resources: frozenset[str] = frozenset({"image", "media", "font", "stylesheet"}),
+    ) -> None:
+        """Initialize a ScrapeEngine instance.
+
+        :param pool_size: Maximum number of pages rendering at the same time
+        :type pool_size: int
+        :param timeout: Navigation timeout in seconds
+        :type timeout: float
+        :param headless: Whether to run the browser without a window
+        :type headless: bool
+        :param blocked_resources: Resource types that are never downloaded
+        :type blocked_resources: frozenset[str]
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headless = headless
+        self.blocked_resources = blocked_resources
+
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._pages: asyncio.Queue[Page] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the browser is up and the page pool is ready."""
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self) -> None:
+        """Launch the browser and fill the page pool.
+
+        Calling it on an already running engine is a no-op.
+        """
+        async with self._lock:
+            if self.running:
+                return
+
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._pages = asyncio.Queue(maxsize=self.pool_size)
+
+            for _ in range(self.pool_size):
+                self._pages.put_nowait(await self._new_page())
+
+    async def stop(self) -> None:
+        """Close every context, the browser and the Playwright runtime."""
+        async with self._lock:
+            if self._browser is not None:
+                with suppress(Exception):
+                    await self._browser.close()
+            if self._playwright is not None:
+                with suppress(Exception):
+                    await self._playwright.stop()
+
+            self._browser = None
+            self._playwright = None
+            self._pages = None
+
+    async def _new_page(self) -> Page:
+        """Open a page on a fresh, isolated browser context."""
+        context = await self._browser.new_context()
+        context.set_default_navigation_timeout(self.timeout * 1000)
+        if self.blocked_resources:
+            await context.route("**/*", self._filter_resources)
+        return await context.new_page()
+
+    async def _filter_resources(self, route: Route) -> None:
+        """Abort requests for resources the scrapers never read."""
+        if route.request.resource_type in self.blocked_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _replace_page(self, page: Page) -> Page:
+        """Discard a page (and its context) that may be in a broken state."""
+        with suppress(Exception):
+            await page.context.close()
+        return await self._new_page()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a page from the pool, waiting while every page is busy.
+
+        The engine is started on first use, so scripts that never went
+        through the application lifespan can use it as well.
+        """
+        if not self.running:
+            await self.start()
+
+        pages = self._pages
+        page = await pages.get()
+        try:
+            yield page
+        except BaseException:
+            page = await self._replace_page(page)
+            raise
+        finally:
+            pages.put_nowait(page)
+
+    async def fetch(self, url: str, *, wait_for: str | None = None) -> str:
+        """Render a URL and return its HTML.
+
+        :param url: The URL to render
+        :type url: str
+        :param wait_for: CSS selector waited for before reading the page; pages never
+            attaching it are read once the timeout expires
+        :type wait_for: str | None
+        :return: The rendered HTML
+        :rtype: str
+        :raises TransientFetchError: If the server throttled the request or failed
+        :raises PageNotFoundError: If the server answered 404 or 410
+        """
+        async with self.page() as page:
+            response = await page.goto(url, wait_until="domcontentloaded")
+            if response is not None and (response.status == 429 or response.status >= 500):
+                raise TransientFetchError(
+                    f"HTTP {response.status} rendering {url}", retry_after=parse_retry_after(response.headers)
+                )
+            if response is not None and response.status in (404, 410):
+                raise PageNotFoundError(f"HTTP {response.status} rendering {url}")
+            if wait_for:
+                # A loaded page lacking the element is returned as is: the caller tells it is not usable
+                with suppress(PlaywrightTimeoutError):
+                    await page.wait_for_selector(wait_for, state="attached", timeout=self.timeout * 1000)
+            return await page.content()
+
+
+scrape_engine = ScrapeEngine()
@@ -0,0 +1,19 @@
+class PageNotCachedError(Exception): ...
+
+
+class CircuitOpenError(Exception): ...
+
+
+class TransientFetchError(Exception):
+    """A fetch failed in a way that may succeed later: throttled, server error or timeout."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PageNotFoundError(Exception):
+    """A page does not exist, or came without the fields its type requires: retrying would not help."""
+
+
+class EditionNotFoundError(Exception): ...
@@ -0,0 +1,255 @@
+"""Targeted extraction of fields from HTML pages.
+
+Each page type declares once, as a PageSpec, the fields it provides and the
+CSS selector of each one. Extractors turn a page into a dictionary of those
+fields; the backends trade generality for speed:
+
+- ``SoupExtractor()``: full BeautifulSoup tree with the pure Python parser.
+- ``SoupExtractor("lxml", restrict=True)``: BeautifulSoup on the C lxml
+  parser, building only the subtrees the selectors can match.
+- ``LexborExtractor()``: selectolax's C lexbor parser, never builds Python
+  objects for the elements it does not return.
+
+``default_extractor`` is the fastest one installed.
+"""
+
+import abc
+import re
+from typing import NamedTuple
+
+from bs4 import BeautifulSoup, FeatureNotFound
+from bs4.filter import ElementFilter
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional C parser
+    LexborHTMLParser = None
+
+
+class Selector(NamedTuple):
+    """Where a field is read from: the text of an element, or one of its attributes."""
+
+    css: str
+    attr: str | None = None
+    many: bool = False
+
+
+class PageSpec(NamedTuple):
+    """Fields extracted from a page type and which of them make the page usable.
+
+    Pages listing repeated elements (search results, card lists) declare the
+    CSS selector of each element as ``item``; the ``item_fields`` are read
+    relative to every element and returned as a list of dicts under ``items``.
+    """
+
+    name: str
+    fields: dict[str, Selector]
+    required: tuple[str, ...] = ()
+    item: str | None = None
+    item_fields: dict[str, Selector] = {}
+
+    @property
+    def wait_for(self) -> str | None:
+        """CSS selector a browser waits for before reading the page."""
+        if self.item:
+            return self.item
+        return self.fields[self.required[0]].css if self.required else None
+
+    def is_complete(self, values: dict) -> bool:
+        """Whether every required field was found with a value, and at least one item for listings.
+
+        :param values: Fields extracted from the page
+        :type values: dict
+        :return: True when the page is usable
+        :rtype: bool
+        """
+        if self.item and not values.get("items"):
+            return False
+        return all(values.get(field) for field in self.required)
+
+
+# Simple selectors restricted parsing can match while the tag is being created:
+# tag, tag.class, .class, #id, tag#id, [attr="value"], tag[attr="value"]
+SIMPLE_SELECTOR = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?:\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)|\[(?P<attr>[\w:-]+)="(?P<value>[^"]*)"\])?$'
+)
+
+
+class SubtreeFilter(ElementFilter):
+    """Keeps only the elements matching a page's selectors, with their descendants."""
+
+    def __init__(self, spec: PageSpec) -> None:
+        """Initialize a SubtreeFilter instance.
+
+        :param spec: Page type whose selectors are kept
+        :type spec: PageSpec
+        :raises ValueError: If a selector is not a simple one
+        """
+        super().__init__()
+        self.rules = []
+        selectors = [selector.css for selector in spec.fields.values()]
+        if spec.item:
+            # Item fields are read inside the item subtrees
+            selectors.append(spec.item)
+
+        for css in selectors:
+            match = SIMPLE_SELECTOR.match(css)
+            if match is None or not any(match.groups()):
+                raise ValueError(f"Selector too complex for restricted parsing: {css}")
+            self.rules.append(match.groupdict())
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix: str | None, name: str, attrs: dict | None) -> bool:
+        attrs = attrs or {}
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+
+        for rule in self.rules:
+            if rule["tag"] and rule["tag"] != name:
+                continue
+            if rule["cls"] and rule["cls"] not in classes:
+                continue
+            if rule["id"] and attrs.get("id") != rule["id"]:
+                continue
+            if rule["attr"] and attrs.get(rule["attr"]) != rule["value"]:
+                continue
+            return True
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+class Extractor(abc.ABC):
+    """Parser backend extracting the fields of a PageSpec from HTML."""
+
+    name: str
+
+    @abc.abstractmethod
+    def extract(self, html: str, spec: PageSpec) -> dict[str, str | list | None]:
+        """Extract the fields of a page.
+
+        :param html: The page HTML
+        :type html: str
+        :param spec: Page type to extract
+        :type spec: PageSpec
+        :return: Stripped text or attribute of each field, None when missing; a list for ``many``
+            fields, and the fields of each item under ``items`` for listings
+        :rtype: dict[str, str | list | None]
+        """
+        raise NotImplementedError
+
+
+class SoupExtractor(Extractor):
+    """BeautifulSoup backend, on any parser it supports, optionally building only the matched subtrees."""
+
+    def __init__(self, features: str = "html.parser", *, restrict: bool = False) -> None:
+        """Initialize a SoupExtractor instance.
+
+        :param features: BeautifulSoup parser ("html.parser", "lxml"...)
+        :type features: str
+        :param restrict: Whether to build only the subtrees matched by the selectors
+        :type restrict: bool
+        """
+        self.features = features
+        self.restrict = restrict
+        self.name = f"soup-{features}{'-restricted' if restrict else ''}"
+        self._filters: dict[str, SubtreeFilter] = {}
+
+    def _filter(self, spec: PageSpec) -> SubtreeFilter | None:
+        if not self.restrict:
+            return None
+        if spec.name not in self._filters:
+            self._filters[spec.name] = SubtreeFilter(spec)
+        return self._filters[spec.name]
+
+    @staticmethod
+    def _value(element, selector: Selector) -> str | None:  # noqa: ANN001
+        if selector.attr:
+            value = element.get(selector.attr)
+            return value.strip() if isinstance(value, str) else None
+        return element.get_text().strip()
+
+    @classmethod
+    def _values(cls, root, fields: dict[str, Selector]) -> dict[str, str | list[str] | None]:  # noqa: ANN001
+        values = {}
+        for field, selector in fields.items():
+            if selector.many:
+                elements = root.select(selector.css)
+                values[field] = [value for element in elements if (value := cls._value(element, selector))]
+            else:
+                element = root.select_one(selector.css)
+                values[field] = cls._value(element, selector) if element is not None else None
+        return values
+
+    def extract(self, html: str, spec: PageSpec) -> dict[str, str | list | None]:
+        document = BeautifulSoup(html, self.features, parse_only=self._filter(spec))
+        values = self._values(document, spec.fields)
+        if spec.item:
+            values["items"] = [self._values(element, spec.item_fields) for element in document.select(spec.item)]
+        document.decompose()
+        return values
+
+
+class LexborExtractor(Extractor):
+    """selectolax backend on the lexbor C parser."""
+
+    name = "lexbor"
+
+    def __init__(self) -> None:
+        """Initialize a LexborExtractor instance.
+
+        :raises ImportError: If selectolax is not installed
+        """
+        if LexborHTMLParser is None:
+            raise ImportError("selectolax is required by the lexbor extractor.")
+
+    @staticmethod
+    def _value(node, selector: Selector) -> str | None:  # noqa: ANN001
+        if selector.attr:
+            value = node.attributes.get(selector.attr)
+            return value.strip() if value else None
+        return node.text(deep=True).strip()
+
+    @classmethod
+    def _values(cls, root, fields: dict[str, Selector]) -> dict[str, str | list[str] | None]:  # noqa: ANN001
+        values = {}
+        for field, selector in fields.items():
+            if selector.many:
+                values[field] = [value for node in root.css(selector.css) if (value := cls._value(node, selector))]
+            else:
+                node = root.css_first(selector.css)
+                values[field] = cls._value(node, selector) if node is not None else None
+        return values
+
+    def extract(self, html: str, spec: PageSpec) -> dict[str, str | list | None]:
+        tree = LexborHTMLParser(html)
+        values = self._values(tree, spec.fields)
+        if spec.item:
+            values["items"] = [self._values(node, spec.item_fields) for node in tree.css(spec.item)]
+        return values
+
+
+def available_extractors() -> list[Extractor]:
+    """Every extractor backend usable with the installed packages, slowest first.
+
+    :return: Extractor instances
+    :rtype: list[Extractor]
+    """
+    extractors: list[Extractor] = [SoupExtractor()]
+    try:
+        BeautifulSoup("", "lxml")
+    except FeatureNotFound:
+        pass
+    else:
+        extractors += [SoupExtractor("lxml"), SoupExtractor("lxml", restrict=True)]
+    if LexborHTMLParser is not None:
+        extractors.append(LexborExtractor())
+    return extractors
+
+
+default_extractor = available_extractors()[-1]
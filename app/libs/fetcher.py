@@ -0,0 +1,300 @@
+import asyncio
+import random
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+
+from app.core.settings import settings
+
+from .cache import PageCache, page_cache
+from .engine import ScrapeEngine, parse_retry_after, scrape_engine
+from .exceptions import PageNotCachedError, PageNotFoundError, TransientFetchError
+from .extract import Extractor, PageSpec, default_extractor
+from .throttle import HostThrottle
+
+
+class HostStats:
+    """Counters of which fetch path served the pages of a host."""
+
+    def __init__(self) -> None:
+        """Initialize a HostStats instance."""
+        self.http = 0
+        self.http_incomplete = 0
+        self.http_errors = 0
+        self.browser = 0
+        self.retries = 0
+        self.failures = 0
+        self.not_found = 0
+
+    @property
+    def http_attempts(self) -> int:
+        """Number of pages first tried over plain HTTP."""
+        return self.http + self.http_incomplete + self.http_errors
+
+    def to_dict(self) -> dict[str, int]:
+        """Return the counters as a dictionary.
+
+        :return: Counters by fetch path
+        :rtype: dict[str, int]
+        """
+        return {
+            "http": self.http,
+            "http_incomplete": self.http_incomplete,
+            "http_errors": self.http_errors,
+            "browser": self.browser,
+            "retries": self.retries,
+            "failures": self.failures,
+            "not_found": self.not_found,
+        }
+
+
+class PageFetcher:
+    """Fetch strategy that tries plain HTTP first and renders with a browser only when needed.
+
+    Pages are requested with a pooled HTTP/2 keep-alive client. When the raw
+    HTML already contains every required field it is used as is; otherwise
+    the page is rendered by the Playwright engine. Pages are never kept as
+    parsed trees: the extractor reads the fields declared by their PageSpec,
+    which also tells whether a page is complete. Hosts whose pages never
+    come complete over HTTP stop being tried that way. Every page obtained
+    is kept in the page cache, which is checked before going to the network.
+
+    Requests to each host go through a HostThrottle that adapts their rate
+    and concurrency and fails fast while the host is down. Transient failures
+    (429, 5xx, timeouts) are retried with jittered exponential backoff. Pages
+    that do not exist (404, or rendered without their required fields) fail
+    at once, without retries and without counting against the host.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: ScrapeEngine | None = None,
+        extractor: Extractor | None = None,
+        cache: PageCache | None = page_cache,
+        offline: bool = False,
+        timeout: float = 15.0,
+        max_connections: int = 20,
+        probe_attempts: int = 20,
+        rate: float = 2.0,
+        burst: int = 4,
+        max_concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        """Initialize a PageFetcher instance.
+
+        :param engine: Browser engine used as fallback, defaults to the shared one
+        :type engine: ScrapeEngine | None
+        :param extractor: Parser backend reading the pages, defaults to the fastest one installed
+        :type extractor: Extractor | None
+        :param cache: Page cache checked before the network, None to disable it
+        :type cache: PageCache | None
+        :param offline: Serve pages from the cache only, even past their TTL
+        :type offline: bool
+        :param timeout: HTTP timeout in seconds
+        :type timeout: float
+        :param max_connections: Maximum number of pooled HTTP connections
+        :type max_connections: int
+        :param probe_attempts: HTTP attempts without a single success before a host goes browser-only
+        :type probe_attempts: int
+        :param rate: Maximum requests per second to a host
+        :type rate: float
+        :param burst: Requests that may be sent to a host at once after an idle period
+        :type burst: int
+        :param max_concurrency: Maximum requests in flight to a host
+        :type max_concurrency: int
+        :param retries: Retries of a page after a transient failure
+        :type retries: int
+        :param backoff: Upper bound in seconds of the first retry delay, doubled on each retry
+        :type backoff: float
+        :param max_backoff: Upper bound in seconds of any retry delay
+        :type max_backoff: float
+        :param failure_threshold: Consecutive failures that open the circuit of a host
+        :type failure_threshold: int
+        :param reset_timeout: Seconds the circuit of a host stays open
+        :type reset_timeout: float
+        """
+        self.engine = engine or scrape_engine
+        self.extractor = extractor or default_extractor
+        self.cache = cache
+        self.offline = offline
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.probe_attempts = probe_attempts
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats: defaultdict[str, HostStats] = defaultdict(HostStats)
+        self.throttles: defaultdict[str, HostThrottle] = defaultdict(
+            lambda: HostThrottle(
+                rate=rate,
+                burst=burst,
+                max_concurrency=max_concurrency,
+                failure_threshold=failure_threshold,
+                reset_timeout=reset_timeout,
+            )
+        )
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={
+                    "User-Agent": (
+                        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                        "Chrome/131.0 Safari/537.36"
+                    ),
+                    "Accept": "text/html,application/xhtml+xml",
+                    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+                },
+            )
+        return self._client
+
+    async def start(self) -> None:
+        """Open the HTTP client and start the browser engine."""
+        _ = self.client
+        await self.engine.start()
+
+    async def stop(self) -> None:
+        """Close the HTTP client and stop the browser engine."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.engine.stop()
+
+    def _use_http(self, host: str) -> bool:
+        """Whether plain HTTP is still worth trying for a host."""
+        stats = self.stats[host]
+        return stats.http > 0 or stats.http_attempts < self.probe_attempts
+
+    def _retry_delay(self, attempt: int, retry_after: float | None) -> float:
+        """Full jitter exponential backoff, never shorter than the host asked for."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        return max(delay, retry_after or 0.0)
+
+    async def _fetch_network(self, url: str, host: str, spec: PageSpec) -> tuple[str, dict]:
+        """Fetch a page over HTTP when possible, rendering it otherwise.
+
+        :raises TransientFetchError: If the host throttled the request, failed or timed out
+        :raises PageNotFoundError: If the page does not exist or was rendered without its required fields
+        """
+        stats = self.stats[host]
+
+        if self._use_http(host):
+            try:
+                response = await self.client.get(url)
+            except httpx.TransportError as exc:
+                stats.http_errors += 1
+                raise TransientFetchError(f"{type(exc).__name__} fetching {url}") from exc
+
+            if response.status_code == 429 or response.status_code >= 500:
+                stats.http_errors += 1
+                raise TransientFetchError(
+                    f"HTTP {response.status_code} fetching {url}", retry_after=parse_retry_after(response.headers)
+                )
+            if response.status_code in (404, 410):
+                raise PageNotFoundError(f"HTTP {response.status_code} fetching {url}")
+
+            if response.is_success:
+                data = response.text
+                values = self.extractor.extract(data, spec)
+                if spec.is_complete(values):
+                    stats.http += 1
+                    return data, values
+                stats.http_incomplete += 1
+            else:
+                stats.http_errors += 1
+
+        try:
+            data = await self.engine.fetch(url, wait_for=spec.wait_for)
+        except (PlaywrightError, TimeoutError) as exc:
+            raise TransientFetchError(f"{type(exc).__name__} rendering {url}") from exc
+        stats.browser += 1
+        values = self.extractor.extract(data, spec)
+        if not spec.is_complete(values):
+            raise PageNotFoundError(f"Page without the {spec.name} fields: {url}")
+        return data, values
+
+    async def fetch(self, url: str, spec: PageSpec) -> dict:
+        """Fetch a page and extract its fields.
+
+        :param url: The URL to fetch
+        :type url: str
+        :param spec: Page type, declaring the fields to extract and those the page must have
+        :type spec: PageSpec
+        :return: Value of each field of the spec, None when missing
+        :rtype: dict
+        :raises TransientFetchError: If the page still failed after every retry
+        :raises PageNotFoundError: If the page does not exist, which is never retried
+        :raises CircuitOpenError: If the host is failing and is not being contacted
+        """
+        if self.cache is not None:
+            data = self.cache.get(url, allow_stale=self.offline)
+            if data is not None:
+                values = self.extractor.extract(data, spec)
+                if self.offline or spec.is_complete(values):
+                    return values
+
+        if self.offline:
+            raise PageNotCachedError(f"Page not cached: {url}")
+
+        host = urlsplit(url).hostname or ""
+        stats = self.stats[host]
+        throttle = self.throttles[host]
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with throttle.request():
+                    data, values = await self._fetch_network(url, host, spec)
+                break
+            except PageNotFoundError:
+                stats.not_found += 1
+                raise
+            except TransientFetchError as exc:
+                if attempt == self.retries:
+                    stats.failures += 1
+                    raise
+                stats.retries += 1
+                await asyncio.sleep(self._retry_delay(attempt, exc.retry_after))
+
+        if self.cache is not None:
+            self.cache.put(url, data)
+
+        return values
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return the fetch path counters and the throttle state by host.
+
+        :return: Counters by fetch path, plus the throttle state under "throttle", by host
+        :rtype: dict[str, dict]
+        """
+        return {
+            host: stats.to_dict() | {"throttle": self.throttles[host].to_dict()} for host, stats in self.stats.items()
+        }
+
+
+page_fetcher = PageFetcher(
+    rate=settings.scrape_rate,
+    burst=settings.scrape_burst,
+    max_concurrency=settings.scrape_max_concurrency,
+    retries=settings.scrape_retries,
+    backoff=settings.scrape_backoff,
+    max_backoff=settings.scrape_max_backoff,
+    failure_threshold=settings.scrape_failure_threshold,
+    reset_timeout=settings.scrape_reset_timeout,
+)
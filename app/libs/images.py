@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from enum import StrEnum
+from pathlib import Path
+from types import TracebackType
+
+import httpx
+from PIL import Image
+
+
+class ImageSize(StrEnum):
+    """Sizes a card image is served in."""
+
+    THUMB = "thumb"
+    MEDIUM = "medium"
+    FULL = "full"
+
+
+# Maximum width of each resized variant, in pixels
+IMAGE_WIDTHS = {ImageSize.THUMB: 160, ImageSize.MEDIUM: 480}
+
+
+class ImageDownloader:
+    """Concurrent, streaming and resumable image downloader.
+
+    Responses are streamed chunk by chunk to a ``.part`` file that is renamed
+    into place once complete, so a target file is either absent or whole.
+    Interrupted downloads resume from their ``.part`` file with a range
+    request. The SHA-256 and size of every finished file are kept in a
+    manifest, so files already downloaded are skipped only when they still
+    match it.
+    """
+
+    MANIFEST = ".manifest.json"
+
+    def __init__(
+        self,
+        directory: str | Path = "images",
+        *,
+        concurrency: int = 16,
+        timeout: float = 30.0,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        """Initialize an ImageDownloader instance.
+
+        :param directory: Directory where images are stored
+        :type directory: str | Path
+        :param concurrency: Maximum number of downloads running at the same time
+        :type concurrency: int
+        :param timeout: HTTP timeout in seconds
+        :type timeout: float
+        :param chunk_size: Bytes read from the response at a time
+        :type chunk_size: int
+        """
+        self.directory = Path(directory)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client: httpx.AsyncClient | None = None
+        self._manifest: dict[str, dict] = self._load_manifest()
+
+    async def __aenter__(self) -> "ImageDownloader":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.save_manifest()
+
+    def _load_manifest(self) -> dict[str, dict]:
+        """Read the manifest of finished downloads."""
+        try:
+            return json.loads((self.directory / self.MANIFEST).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self) -> None:
+        """Write the manifest of finished downloads atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / self.MANIFEST
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifest, sort_keys=True))
+        tmp.replace(path)
+
+    def _sha256(self, path: Path) -> str:
+        """Hash a file in chunks."""
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            while chunk := f.read(self.chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_current(self, name: str) -> bool:
+        """Whether an image exists and matches the checksum recorded when it was downloaded.
+
+        :param name: File name of the image
+        :type name: str
+        :return: True when the download can be skipped
+        :rtype: bool
+        """
+        path = self.directory / name
+        entry = self._manifest.get(name)
+        if entry is None or not path.exists() or path.stat().st_size != entry["size"]:
+            return False
+        return self._sha256(path) == entry["sha256"]
+
+    async def download(self, url: str, name: str) -> str:
+        """Download one image unless it is already current.
+
+        :param url: The URL of the image
+        :type url: str
+        :param name: File name to save the image as
+        :type name: str
+        :return: One of "skipped", "downloaded", "resumed" or "failed"
+        :rtype: str
+        """
+        async with self._semaphore:
+            if await asyncio.to_thread(self.is_current, name):
+                return "skipped"
+
+            try:
+                return await self._stream(url, name)
+            except httpx.HTTPError:
+                return "failed"
+
+    async def _stream(self, url: str, name: str, resume: bool = True) -> str:
+        """Stream an image into its part file, resuming it when possible, then move it into place."""
+        target = self.directory / name
+        part = target.with_name(f"{name}.part")
+        offset = part.stat().st_size if resume and part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        digest = hashlib.sha256()
+
+        async with self._client.stream("GET", url, headers=headers) as response:
+            # The part file no longer matches the remote image: start over
+            restart = response.status_code == 416
+            if not restart:
+                response.raise_for_status()
+
+                resumed = offset > 0 and response.status_code == 206
+                if resumed:
+                    with part.open("rb") as f:
+                        while chunk := f.read(self.chunk_size):
+                            digest.update(chunk)
+
+                with part.open("ab" if resumed else "wb") as f:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+
+        if restart:
+            part.unlink(missing_ok=True)
+            return await self._stream(url, name, resume=False)
+
+        os.replace(part, target)
+        self._manifest[name] = {"sha256": digest.hexdigest(), "size": target.stat().st_size, "url": url}
+        return "resumed" if resumed else "downloaded"
+
+    async def download_many(self, items: Iterable[tuple[str, str]]) -> Counter:
+        """Download many images concurrently, saving the manifest when done.
+
+        :param items: Tuples of (url, name)
+        :type items: Iterable[tuple[str, str]]
+        :return: Number of images by outcome
+        :rtype: Counter
+        """
+        results = await asyncio.gather(*(self.download(url, name) for url, name in items))
+        self.save_manifest()
+        return Counter(results)
+
+
+class ImageVariants:
+    """Resized variants of the downloaded images.
+
+    Each variant is generated once, on first use, and stored in a
+    sub-directory named after its size (``images/thumb/<name>``). It is
+    generated again only when the original image is newer.
+    """
+
+    def __init__(self, directory: str | Path = "images", *, quality: int = 85) -> None:
+        """Initialize an ImageVariants instance.
+
+        :param directory: Directory where the original images are stored
+        :type directory: str | Path
+        :param quality: JPEG quality of the variants
+        :type quality: int
+        """
+        self.directory = Path(directory)
+        self.quality = quality
+
+    def path(self, name: str, size: ImageSize = ImageSize.FULL) -> Path:
+        """Return the file of an image in a given size, generating it if needed.
+
+        Blocking: call it from a worker thread in async code.
+
+        :param name: File name of the original image
+        :type name: str
+        :param size: Size of the image
+        :type size: ImageSize
+        :return: Path of the image file
+        :rtype: Path
+        :raises FileNotFoundError: If the original image was not downloaded, or cannot be read as an
+            image; it is then removed, so that the next sync downloads it again
+        """
+        source = self.directory / name
+        source_mtime = source.stat().st_mtime
+
+        if size == ImageSize.FULL:
+            return source
+
+        target = self.directory / size.value / name
+        if target.exists() and target.stat().st_mtime >= source_mtime:
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{name}.{uuid.uuid4().hex}.tmp")
+        width = IMAGE_WIDTHS[size]
+
+        try:
+            with Image.open(source) as image:
+                image.thumbnail((width, width * 2), Image.Resampling.LANCZOS)
+                resized = image.convert("RGB")
+        except OSError as exc:
+            # Not an image (UnidentifiedImageError) or truncated: the download is not usable
+            source.unlink(missing_ok=True)
+            raise FileNotFoundError(f"Unreadable image: {source}") from exc
+
+        resized.save(tmp, "JPEG", quality=self.quality, optimize=True, progressive=True)
+        tmp.replace(target)
+        return target
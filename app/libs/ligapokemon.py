@@ -1,44 +1,77 @@
+import asyncio
+from collections.abc import Iterable
 from pathlib import Path
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urljoin
 
 import httpx
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
 from app.domain.schemas import CardLoad, EditionLoad
 
+from .exceptions import EditionNotFoundError, PageNotFoundError
+from .extract import PageSpec, Selector
+from .fetcher import PageFetcher, page_fetcher
+
+CARD_PAGE = PageSpec(
+    "card",
+    {
+        "name": Selector(".item-name"),
+        "rarity": Selector("#details-screen-rarity"),
+        "edition_code": Selector(".sigla-edition"),
+        "edition_name": Selector(".name-edition"),
+        "edition_year": Selector(".year-edition"),
+        "image": Selector('meta[property="og:image"]', attr="content"),
+    },
+    required=("name", "rarity", "edition_code", "edition_name", "edition_year"),
+)
+
+EDITION_PAGE = PageSpec(
+    "edition",
+    {
+        "edition_code": Selector(".sigla-edition"),
+        "edition_name": Selector(".name-edition"),
+        "edition_year": Selector(".year-edition"),
+        "next": Selector('a[rel="next"]', attr="href"),
+    },
+    required=("edition_code", "edition_name", "edition_year"),
+    item=".card-item",
+    item_fields={
+        "number": Selector(".card-number"),
+        "name": Selector(".card-name"),
+        "rarity": Selector(".card-rarity"),
+    },
+)
+
+# Page types of the site, by name
+PAGE_SPECS = {spec.name: spec for spec in (CARD_PAGE, EDITION_PAGE)}
+
 
 class LigaPokemon:
     """Class for webscraping data from Liga Pokemon website."""
 
-    def __init__(self) -> None:
+    def __init__(self, fetcher: PageFetcher | None = None) -> None:
         """Initialize a LigaPokemon instance.
 
         :param self: The LigaPokemon instance
+        :param fetcher: Page fetcher used to load pages, defaults to the shared one
+        :type fetcher: PageFetcher | None
         """
         self.data = None
+        self.fetcher = fetcher or page_fetcher
         self.URL_BASE = "https://www.ligapokemon.com.br"
 
-    def _load_data(self, url: str) -> None:
+    async def _load_data(self, url: str, spec: PageSpec) -> None:
         """Load data from a given URL.
 
         :param self: The LigaPokemon instance
         :param url: The URL to load data from
         :type url: str
+        :param spec: Page type, declaring the fields to extract
+        :type spec: PageSpec
         """
         if self.data:
             return
 
-        data = None
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url)
-            data = page.content()
-            browser.close()
-
-        self.data = BeautifulSoup(data, "html.parser")
+        self.data = await self.fetcher.fetch(url, spec)
 
     def load_image(self, url: str, filename: str) -> None:
         """Load image data from a given URL.
@@ -55,22 +88,128 @@ class LigaPokemon:
         with Path(filename).open("wb") as f:
             f.write(response.content)
 
-    def get_edition(self) -> EditionLoad:
-        """Fetch available editions from the league.
+    async def get_edition(self) -> EditionLoad:
+        """Fetch the edition of the last card page loaded.
 
         :param self: The LigaPokemon instance
-        :return: Dictionary of edition codes and names
-        :rtype: dict[str, str]
+        :return: Edition load schema
+        :rtype: EditionLoad
         """
         params = {
-            "code": self.data.select_one(".sigla-edition").text.strip(),
-            "name": self.data.select_one(".name-edition").text.strip(),
-            "year": self.data.select_one(".year-edition").text.strip(),
+            "code": self.data["edition_code"],
+            "name": self.data["edition_name"],
+            "year": self.data["edition_year"],
         }
 
         return EditionLoad.model_validate(params)
 
-    def get_card(self, card_id: str, set_id: str, edition_slug: str) -> CardLoad:
+    def _card_url(self, card_id: str, set_id: str, edition_slug: str) -> str:
+        """Build the URL of a card page.
+
+        :param self: The LigaPokemon instance
+        :param card_id: ID of the card
+        :type card_id: str
+        :param set_id: ID of the set
+        :type set_id: str
+        :param edition_slug: Edition code of the card
+        :type edition_slug: str
+        :return: URL of the card page
+        :rtype: str
+        """
+        params = {"view": "cards/search", "card": f"{card_id}/{set_id}", "ed": edition_slug}
+        return f"{self.URL_BASE}/?{urlencode(params)}"
+
+    def _edition_url(self, edition_slug: str) -> str:
+        """Build the URL of the first page listing the cards of an edition.
+
+        :param self: The LigaPokemon instance
+        :param edition_slug: Edition code
+        :type edition_slug: str
+        :return: URL of the listing
+        :rtype: str
+        """
+        params = {"view": "cards/search", "ed": edition_slug}
+        return f"{self.URL_BASE}/?{urlencode(params)}"
+
+    async def get_edition_cards(self, edition_slug: str, *, max_pages: int = 50) -> tuple[EditionLoad, list[CardLoad]]:
+        """Fetch an edition and every card it lists, following its listing pages.
+
+        Each listing page holds the number, name and rarity of many cards, so a
+        whole edition takes a handful of page loads instead of one per card.
+        Cards listed without a "card_id/set_id" number are skipped.
+
+        :param self: The LigaPokemon instance
+        :param edition_slug: Edition code
+        :type edition_slug: str
+        :param max_pages: Maximum number of listing pages followed
+        :type max_pages: int
+        :return: Edition load schema and card load schemas, in listing order
+        :rtype: tuple[EditionLoad, list[CardLoad]]
+        :raises EditionNotFoundError: If the first page does not describe the edition
+        """
+        url = self._edition_url(edition_slug)
+        edition = None
+        cards = []
+
+        for _ in range(max_pages):
+            try:
+                page = await self.fetcher.fetch(url, EDITION_PAGE)
+            except PageNotFoundError as exc:
+                if edition is None:
+                    raise EditionNotFoundError(f"Edition not found: {edition_slug}") from exc
+                raise
+            if edition is None:
+                if not EDITION_PAGE.is_complete(page):
+                    raise EditionNotFoundError(f"Edition not found: {edition_slug}")
+                edition = EditionLoad.model_validate(
+                    {"code": page["edition_code"], "name": page["edition_name"], "year": page["edition_year"]}
+                )
+
+            for item in page["items"]:
+                card_id, _, set_id = (item["number"] or "").partition("/")
+                if not card_id or not set_id or not item["name"]:
+                    continue
+                cards.append(
+                    CardLoad.model_validate(
+                        {
+                            "card_id": card_id.strip(),
+                            "set_id": set_id.strip(),
+                            "edition_code": edition_slug,
+                            "name": item["name"],
+                            "rarity": item["rarity"] or "",
+                        }
+                    )
+                )
+
+            if not page["next"]:
+                break
+            url = urljoin(url, page["next"])
+
+        return edition, cards
+
+    async def get_image_url(self, card_id: str, set_id: str, edition_slug: str) -> str | None:
+        """Fetch the URL of a card's image from its page.
+
+        The card page is the same one read by get_card, so it is usually
+        served by the page cache.
+
+        :param self: The LigaPokemon instance
+        :param card_id: ID of the card
+        :type card_id: str
+        :param set_id: ID of the set
+        :type set_id: str
+        :param edition_slug: Edition code of the card
+        :type edition_slug: str
+        :return: Absolute URL of the image, or None if the page has none
+        :rtype: str | None
+        """
+        await self._load_data(self._card_url(card_id, set_id, edition_slug), CARD_PAGE)
+
+        if not self.data["image"]:
+            return None
+        return urljoin(self.URL_BASE, self.data["image"])
+
+    async def get_card(self, card_id: str, set_id: str, edition_slug: str) -> CardLoad:
         """Fetch data for a specific card in a league.
 
         :param self: The LigaPokemon instance
@@ -83,17 +222,44 @@ class LigaPokemon:
         :return: Card load schema
         :rtype: CardLoad
         """
-        params = {"view": "cards/search", "card": f"{card_id}/{set_id}", "ed": edition_slug}
-        url = f"{self.URL_BASE}/?{urlencode(params)}"
-
-        self._load_data(url)
+        await self._load_data(self._card_url(card_id, set_id, edition_slug), CARD_PAGE)
 
         params = {
             "card_id": card_id,
             "set_id": set_id,
             "edition_code": edition_slug,
-            "name": self.data.select_one(".item-name").text.strip(),
-            "rarity": self.data.select_one("#details-screen-rarity").text.strip(),
+            "name": self.data["name"],
+            "rarity": self.data["rarity"],
         }
 
         return CardLoad.model_validate(params)
+
+    @classmethod
+    async def get_cards(
+        cls,
+        identifiers: Iterable[tuple[str, str, str]],
+        *,
+        fetcher: PageFetcher | None = None,
+    ) -> list[tuple[CardLoad, EditionLoad] | Exception]:
+        """Fetch many cards at once, sharing the fetcher's connection and page pools.
+
+        Pages are loaded concurrently, bounded by the HTTP connection pool and,
+        for pages that need rendering, by the engine pool size. A failure on
+        one card does not cancel the others; its exception is returned in
+        place of the result.
+
+        :param cls: The LigaPokemon class
+        :param identifiers: Tuples of (card_id, set_id, edition_slug)
+        :type identifiers: Iterable[tuple[str, str, str]]
+        :param fetcher: Page fetcher used to load pages, defaults to the shared one
+        :type fetcher: PageFetcher | None
+        :return: Card and edition load schemas, in the same order as the identifiers
+        :rtype: list[tuple[CardLoad, EditionLoad] | Exception]
+        """
+
+        async def load(card_id: str, set_id: str, edition_slug: str) -> tuple[CardLoad, EditionLoad]:
+            liga = cls(fetcher=fetcher)
+            card = await liga.get_card(card_id, set_id, edition_slug)
+            return card, await liga.get_edition()
+
+        return await asyncio.gather(*(load(*item) for item in identifiers), return_exceptions=True)
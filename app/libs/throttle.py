@@ -0,0 +1,234 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .exceptions import CircuitOpenError, TransientFetchError
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every request fails fast for ``reset_timeout`` seconds. Then a single
+    probe request is let through (half-open): its success closes the
+    circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Initialize a CircuitBreaker instance.
+
+        :param failure_threshold: Consecutive failures that open the circuit
+        :type failure_threshold: int
+        :param reset_timeout: Seconds the circuit stays open before a probe is allowed
+        :type reset_timeout: float
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def acquire(self) -> None:
+        """Let a request through, or fail fast while the circuit is open.
+
+        :raises CircuitOpenError: If the circuit is open, or half-open with its probe in flight
+        """
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._probing):
+            self.rejected += 1
+            raise CircuitOpenError("Circuit open: host is failing, try again later.")
+        if state == self.HALF_OPEN:
+            self._probing = True
+
+    def release(self) -> None:
+        """End a request whose outcome says nothing about the host's health."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """End a successful request, closing the circuit."""
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """End a failed request, opening the circuit when failures pile up or the probe failed."""
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.state == self.CLOSED:
+                self.opened += 1
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def to_dict(self) -> dict[str, int | str]:
+        """Return the breaker state and counters.
+
+        :return: State, consecutive failures, times opened and requests rejected
+        :rtype: dict[str, int | str]
+        """
+        return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+
+class HostThrottle:
+    """Adaptive rate and concurrency limiter for the requests to one host.
+
+    Requests take a token from a bucket refilled at ``rate`` per second and a
+    slot among ``limit`` concurrent ones. Both adapt AIMD-style: every success
+    raises them a little towards their maximum, and every transient failure
+    (429, 5xx, timeout) halves them, at most once per ``cooldown`` so a burst
+    of failures from requests already in flight counts once. A ``Retry-After``
+    from the host pauses it for that long. A circuit breaker fails fast while
+    the host is down.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 2.0,
+        burst: int = 4,
+        max_concurrency: int = 8,
+        min_rate: float = 0.1,
+        cooldown: float = 1.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        """Initialize a HostThrottle instance.
+
+        :param rate: Maximum requests per second
+        :type rate: float
+        :param burst: Requests that may be sent at once after an idle period
+        :type burst: int
+        :param max_concurrency: Maximum requests in flight
+        :type max_concurrency: int
+        :param min_rate: Requests per second the rate never drops below
+        :type min_rate: float
+        :param cooldown: Minimum seconds between two back-offs
+        :type cooldown: float
+        :param failure_threshold: Consecutive failures that open the circuit
+        :type failure_threshold: int
+        :param reset_timeout: Seconds the circuit stays open before a probe is allowed
+        :type reset_timeout: float
+        """
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.cooldown = cooldown
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+
+        self.rate = rate
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.successes = 0
+        self.throttled = 0
+        self.backoffs = 0
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._backed_off_at = 0.0
+        self._slots = asyncio.Condition()
+
+    async def _take_token(self) -> None:
+        """Wait for the host pause to end and for a token of the bucket."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[None]:
+        """Wait for permission to send a request to the host, recording its outcome.
+
+        A TransientFetchError raised in the block backs off and counts as a
+        failure for the circuit breaker; completing the block counts as a
+        success. Any other exception, such as PageNotFoundError, leaves the
+        limits unchanged.
+
+        :raises CircuitOpenError: If the circuit is open
+        """
+        self.breaker.acquire()
+        try:
+            async with self._slots:
+                await self._slots.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+            try:
+                await self._take_token()
+                yield
+            finally:
+                async with self._slots:
+                    self.in_flight -= 1
+                    self._slots.notify_all()
+        except TransientFetchError as exc:
+            self._back_off(exc.retry_after)
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            self._speed_up()
+            self.breaker.record_success()
+
+    def _speed_up(self) -> None:
+        """Additive increase after a success."""
+        self.successes += 1
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+        self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def _back_off(self, retry_after: float | None) -> None:
+        """Multiplicative decrease after a transient failure."""
+        self.throttled += 1
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        if now - self._backed_off_at < self.cooldown:
+            return
+        self._backed_off_at = now
+        self.backoffs += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.limit = max(1.0, self.limit / 2)
+
+    def to_dict(self) -> dict[str, int | float | dict]:
+        """Return the limiter state and counters.
+
+        :return: Current and maximum rate and concurrency, counters and circuit breaker state
+        :rtype: dict[str, int | float | dict]
+        """
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "backoffs": self.backoffs,
+            "circuit": self.breaker.to_dict(),
+        }
@@ -1,7 +1,19 @@
 """Repository package initialization."""
 
-from .exceptions import UnknownFilterError
-from .repositories import CardRepository, EditionRepository, PokedexRepository
-from .uow import UnitOfWork
+from .base import AsyncRepository, Repository
+from .exceptions import InvalidCursorError, UnknownFilterError
+from .repositories import CardRepository, EditionRepository, JobRepository, PokedexRepository
+from .uow import AsyncUnitOfWork, UnitOfWork
 
-__all__ = ["CardRepository", "EditionRepository", "PokedexRepository", "UnknownFilterError", "UnitOfWork"]
+__all__ = [
+    "AsyncRepository",
+    "AsyncUnitOfWork",
+    "CardRepository",
+    "EditionRepository",
+    "InvalidCursorError",
+    "JobRepository",
+    "PokedexRepository",
+    "Repository",
+    "UnknownFilterError",
+    "UnitOfWork",
+]
@@ -1,44 +1,297 @@
-from typing import Any, TypeVar
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Sequence
+from threading import Lock
+from typing import Any, ClassVar, TypeVar
 
+from sqlalchemy import Row, event, inspect, tuple_
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .exceptions import UnknownFilterError
+from app.core.settings import settings
+
+from .cursor import NEXT, PREV, decode_cursor, encode_cursor
+from .exceptions import InvalidCursorError, UnknownFilterError
+from .filters import EQ, IN, RANGE, FilterField, condition, split_filter
 
 T = TypeVar("T")
 
+# Key of Session.info holding the names of the entities whose counts the session's transaction made stale
+STALE_COUNTS = "stale_counts"
+
 
 class Repository[T]:
+    # Loader options (selectinload/joinedload...) applied to every read unless overridden
+    default_options: tuple[LoaderOption, ...] = ()
+    # Seconds a COUNT(*) result is reused; writes through any repository of the entity drop it once committed
+    count_ttl: float = 30.0
+    # Totals kept at most, least recently used first out: their keys hold the filter values clients send
+    count_cache_size: ClassVar[int] = settings.count_cache_size
+    _counts: ClassVar[OrderedDict[tuple, tuple[float, int]]] = OrderedDict()
+    _counts_lock: ClassVar[Lock] = Lock()
+    # Bumped each time the counts of an entity are dropped, so a count started before is not cached after
+    _count_generations: ClassVar[dict[str, int]] = {}
+    # Fields listings can be filtered and sorted by, each backed by an index (see .filters); id always is
+    filter_fields: ClassVar[dict[str, FilterField]] = {}
+    # Named column projections for read-only listings: output field -> column of the entity or of an entity
+    # it has a relationship to. Listing with one returns immutable Rows instead of tracked entities.
+    projections: ClassVar[dict[str, dict[str, Any]]] = {}
+
     def __init__(self, session: Session, entity: type[T]) -> None:
         self._session = session
         self._entity = entity
 
-    def get_by_id(self, id: int) -> T | None:
-        stmt = select(self._entity).where(self._entity.id == id)
+    def _loader_options(self, options: Sequence[LoaderOption] | None) -> Sequence[LoaderOption]:
+        return self.default_options if options is None else options
+
+    def get_by_id(self, id: int, *, options: Sequence[LoaderOption] | None = None) -> T | None:
+        stmt = select(self._entity).where(self._entity.id == id).options(*self._loader_options(options))
         return self._session.exec(stmt).one_or_none()
 
-    def list(self, *, filters: dict[str, Any] | None = None, skip: int = 0, limit: int = 100) -> tuple[list[T], int]:
-        stmt = select(self._entity)
-        count_stmt = select(func.count()).select_from(self._entity)
+    def _filter_field(self, name: str) -> FilterField:
+        if name == "id":
+            return self.filter_fields.get("id") or FilterField(self._entity.id, frozenset({EQ, IN, *RANGE}))
+        if name not in self.filter_fields:
+            raise UnknownFilterError("Filtro inválido.")
+        return self.filter_fields[name]
 
+    def _apply_filters(self, stmt: Any, filters: dict[str, Any] | None) -> Any:
         if filters:
-            for field, value in filters.items():
-                if not hasattr(self._entity, field):
-                    raise UnknownFilterError("Filtro inválido.")
-                stmt = stmt.where(getattr(self._entity, field) == value)
-                count_stmt = count_stmt.where(getattr(self._entity, field) == value)
+            for key, value in filters.items():
+                field, operator = split_filter(key)
+                stmt = stmt.where(condition(self._filter_field(field), operator, value))
+        return stmt
+
+    def _sort_columns(self, sort: str) -> list[Any]:
+        name = sort.removeprefix("-")
+        if name != "id" and not (name in self.filter_fields and self.filter_fields[name].sortable):
+            raise UnknownFilterError("Ordenação inválida.")
+        field = self._filter_field(name)
+        if field.column is self._entity.id:
+            return [self._entity.id]
+        return [field.column, self._entity.id]
+
+    def _projection(self, name: str) -> dict[str, Any]:
+        if name not in self.projections:
+            raise UnknownFilterError("Projeção inválida.")
+        return self.projections[name]
+
+    def _select(self, options: Sequence[LoaderOption] | None, projection: str | None) -> Any:
+        if projection is None:
+            return select(self._entity).options(*self._loader_options(options))
+
+        columns = self._projection(projection)
+        stmt = select(*(column.label(name) for name, column in columns.items())).select_from(self._entity)
+        # Join the related entities the projection reads from; outer, so rows match the entity listing
+        related = {getattr(column, "class_", self._entity) for column in columns.values()} - {self._entity}
+        for relationship in inspect(self._entity).relationships:
+            if relationship.mapper.class_ in related:
+                stmt = stmt.outerjoin(getattr(self._entity, relationship.key))
+        return stmt
+
+    def _order(self, stmt: Any, sort: str) -> Any:
+        descending = sort.startswith("-")
+        return stmt.order_by(*(column.desc() if descending else column for column in self._sort_columns(sort)))
+
+    def _sort_fields(self, sort: str, projection: str | None) -> list[str]:
+        columns = self._sort_columns(sort)
+        if projection is None:
+            return [column.key for column in columns]
+
+        # Cursors are built from the row, so the sort columns must be part of the projection
+        fields = {id(column): name for name, column in self._projection(projection).items()}
+        if any(id(column) not in fields for column in columns):
+            raise UnknownFilterError("Ordenação inválida.")
+        return [fields[id(column)] for column in columns]
+
+    def count(self, *, filters: dict[str, Any] | None = None) -> int:
+        name = self._entity.__name__
+        count_stmt = self._apply_filters(select(func.count()).select_from(self._entity), filters)
+        if self.has_pending_writes():
+            # The session wrote the entity and has not committed yet: count its own writes, without caching them
+            return self._session.exec(count_stmt).one()
 
+        key = (name, tuple(sorted((filters or {}).items())))
+        with self._counts_lock:
+            cached = self._counts.get(key)
+            if cached and cached[0] > time.monotonic():
+                self._counts.move_to_end(key)
+                return cached[1]
+
+        generation = self._count_generations.get(name, 0)
         total = self._session.exec(count_stmt).one()
+        if self._count_generations.get(name, 0) == generation:
+            self._cache_count(key, total)
+        return total
+
+    def _cache_count(self, key: tuple, total: int) -> None:
+        now = time.monotonic()
+        with self._counts_lock:
+            for expired in [key for key, (expires, _) in self._counts.items() if expires <= now]:
+                del self._counts[expired]
+            self._counts[key] = (now + self.count_ttl, total)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.count_cache_size:
+                self._counts.popitem(last=False)
+
+    def has_pending_writes(self) -> bool:
+        # Whether the session's transaction wrote the entity through a repository and has not committed yet
+        return self._entity.__name__ in self._session.info.get(STALE_COUNTS, ())
+
+    def _invalidate_counts(self, *entities: type) -> None:
+        # Dropped once the transaction commits (see _drop_committed_counts): dropped at flush, a concurrent
+        # reader could cache the total the transaction is about to replace, and a rollback would drop them for nothing
+        names = {entity.__name__ for entity in entities or (self._entity,)}
+        self._session.info.setdefault(STALE_COUNTS, set()).update(names)
+
+    @classmethod
+    def _drop_counts(cls, names: set[str]) -> None:
+        for name in names:
+            cls._count_generations[name] = cls._count_generations.get(name, 0) + 1
+        with cls._counts_lock:
+            for key in [key for key in cls._counts if key[0] in names]:
+                del cls._counts[key]
+
+    def list(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        options: Sequence[LoaderOption] | None = None,
+        sort: str = "id",
+        with_total: bool = True,
+        projection: str | None = None,
+    ) -> tuple[list[T] | list[Row], int | None]:
+        stmt = self._order(self._apply_filters(self._select(options, projection), filters), sort)
+
+        total = self.count(filters=filters) if with_total else None
         items = self._session.exec(stmt.offset(skip).limit(limit)).all()
 
         return items, total
 
+    def list_keyset(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        options: Sequence[LoaderOption] | None = None,
+        sort: str = "id",
+        projection: str | None = None,
+    ) -> tuple[Sequence[T] | Sequence[Row], str | None, str | None]:
+        """Read one page after (or before) a cursor, seeking by index instead of skipping rows.
+
+        Returns the page items, or Rows of the named projection, and the cursors of the next and previous pages.
+        """
+        columns = self._sort_columns(sort)
+        fields = self._sort_fields(sort, projection)
+        stmt = self._apply_filters(self._select(options, projection), filters)
+
+        direction = NEXT
+        if cursor is not None:
+            key, direction = decode_cursor(cursor)
+            if len(key) != len(columns):
+                raise InvalidCursorError("Cursor inválido.")
+
+        # Rows are read in ascending order of the sort columns when moving forward along the sort
+        ascending = (direction == NEXT) != sort.startswith("-")
+        if cursor is not None:
+            position = tuple_(*columns) if len(columns) > 1 else columns[0]
+            boundary = tuple_(*key) if len(key) > 1 else key[0]
+            stmt = stmt.where(position > boundary if ascending else position < boundary)
+
+        order = columns if ascending else [column.desc() for column in columns]
+        items = list(self._session.exec(stmt.order_by(*order).limit(limit + 1)).all())
+
+        has_more = len(items) > limit
+        items = items[:limit]
+        if direction == PREV:
+            items.reverse()
+
+        if not items:
+            return items, None, None
+
+        first = [getattr(items[0], field) for field in fields]
+        last = [getattr(items[-1], field) for field in fields]
+        if direction == NEXT:
+            next_cursor = encode_cursor(last, NEXT) if has_more else None
+            prev_cursor = encode_cursor(first, PREV) if cursor is not None else None
+        else:
+            next_cursor = encode_cursor(last, NEXT)
+            prev_cursor = encode_cursor(first, PREV) if has_more else None
+
+        return items, next_cursor, prev_cursor
+
+    def select_rows(self, projection: str, *, filters: dict[str, Any] | None = None, sort: str = "id") -> Any:
+        """Build the statement reading every row of a projection, filtered and sorted, for streaming.
+
+        Nothing is executed: run it with ``stream``/``yield_per`` to read it in batches from a server-side cursor.
+        """
+        return self._order(self._apply_filters(self._select(None, projection), filters), sort)
+
+    def attach(self, entity: T) -> T:
+        """Return a copy of a detached entity bound to this session, without querying it."""
+        return self._session.merge(entity, load=False)
+
     def save(self, entity: T) -> T:
         self._session.add(entity)
         self._session.flush()
-        self._session.refresh(entity)
+        # Columns only: refreshing relationships would expire them, and they cannot lazy load on the async path
+        self._session.refresh(entity, attribute_names=[attr.key for attr in inspect(entity).mapper.column_attrs])
+        self._invalidate_counts()
         return entity
 
+    def save_all(self, entities: Sequence[T]) -> Sequence[T]:
+        self._session.add_all(entities)
+        self._session.flush()
+        self._invalidate_counts()
+        return entities
+
     def remove(self, id: int) -> None:
         entity = self.get_by_id(id=id)
         self._session.delete(entity)
         self._session.flush()
+        self._invalidate_counts()
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _drop_committed_counts(session: OrmSession) -> None:
+    names = session.info.pop(STALE_COUNTS, None)
+    if names:
+        Repository._drop_counts(names)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _keep_rolled_back_counts(session: OrmSession) -> None:
+    session.info.pop(STALE_COUNTS, None)
+
+
+class AsyncRepository[R: Repository]:
+    """Async facade over a repository.
+
+    Every method of the wrapped repository becomes a coroutine that runs it
+    through ``AsyncSession.run_sync``, on the async session's underlying sync
+    session, so queries are written once and shared by the sync and async
+    paths. Relationships must be eager loaded (see ``default_options``),
+    since lazy loads cannot happen outside ``run_sync``.
+    """
+
+    def __init__(self, session: AsyncSession, repository: type[R], entity: type) -> None:
+        self._session = session
+        self._repository = repository
+        self._entity = entity
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        if name.startswith("_") or not callable(getattr(self._repository, name, None)):
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._session.run_sync(
+                lambda session: getattr(self._repository(session, self._entity), name)(*args, **kwargs)
+            )
+
+        call.__name__ = name
+        return call
@@ -0,0 +1,41 @@
+import base64
+import json
+from typing import Any
+
+from .exceptions import InvalidCursorError
+
+NEXT = "n"
+PREV = "p"
+
+
+def encode_cursor(key: list[Any], direction: str = NEXT) -> str:
+    """Encode a keyset position into an opaque, URL-safe cursor.
+
+    :param key: Values of the sort columns of the boundary row
+    :param direction: NEXT to read the rows after the key, PREV for the rows before it
+    :return: Opaque cursor
+    """
+    payload = json.dumps({"k": key, "d": direction}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[list[Any], str]:
+    """Decode a cursor built by encode_cursor.
+
+    :param cursor: Opaque cursor
+    :return: Tuple of (key, direction)
+    :raises InvalidCursorError: If the cursor is malformed or its key holds anything but scalars
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key, direction = payload["k"], payload["d"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Cursor inválido.") from e
+
+    if not isinstance(key, list) or direction not in (NEXT, PREV):
+        raise InvalidCursorError("Cursor inválido.")
+    # Keys hold the values of sort columns: anything but a JSON scalar was not built by encode_cursor
+    if not all(value is None or isinstance(value, str | int | float) for value in key):
+        raise InvalidCursorError("Cursor inválido.")
+
+    return key, direction
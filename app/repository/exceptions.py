@@ -1 +1,4 @@
 class UnknownFilterError(Exception): ...
+
+
+class InvalidCursorError(Exception): ...
@@ -0,0 +1,98 @@
+"""Filter query language of the repository listings.
+
+Filters are given as ``{"<field>[__<operator>]": "<value>"}``, the raw
+strings of query parameters:
+
+- ``rarity=Rare``: equality (``eq``, the default operator)
+- ``rarity__in=Rare,Common``: any of comma separated values
+- ``id__gte=100``, ``id__gt``, ``id__lte``, ``id__lt``: ranges
+- ``name__prefix=Char``: values starting with a string, case-sensitive
+
+Only the fields a repository allows in its ``filter_fields`` can be used,
+each with its own operators, so every filter is served by an index.
+"""
+
+from typing import Any, NamedTuple
+
+from sqlalchemy import and_, select
+
+from .exceptions import UnknownFilterError
+
+EQ = "eq"
+IN = "in"
+PREFIX = "prefix"
+RANGE = frozenset({"gt", "gte", "lt", "lte"})
+
+MAX_IN_VALUES = 100
+
+
+class FilterField(NamedTuple):
+    """A field listings can be filtered by, and sorted by when it is a column of the entity itself."""
+
+    column: Any
+    operators: frozenset[str] = frozenset({EQ, IN})
+    # Column of the entity, when the field belongs to a related entity: filtered as ``via IN (SELECT key ...)``
+    via: Any = None
+    # Column of the related entity ``via`` refers to, its id by default
+    key: Any = None
+
+    @property
+    def sortable(self) -> bool:
+        return self.via is None
+
+
+def split_filter(key: str) -> tuple[str, str]:
+    """Split a filter key into its field and operator.
+
+    :param key: Filter key, ``field`` or ``field__operator``
+    :return: Tuple of (field, operator)
+    """
+    field, _, operator = key.partition("__")
+    return field, operator or EQ
+
+
+def _convert(field: FilterField, value: str) -> Any:
+    # Values are strings unless the column is numeric (sqlmodel strings report object as their python type)
+    python_type = field.column.type.python_type
+    if python_type not in (int, float):
+        return value
+    try:
+        return python_type(value)
+    except ValueError:
+        raise UnknownFilterError("Valor de filtro inválido.") from None
+
+
+def condition(field: FilterField, operator: str, value: str) -> Any:
+    """Build the SQL condition of one filter.
+
+    :param field: The filtered field
+    :param operator: Operator of the filter, one the field allows
+    :param value: Raw value of the filter
+    :return: SQL condition on the entity
+    :raises UnknownFilterError: If the operator is not allowed or the value does not fit the column
+    """
+    if operator not in field.operators:
+        raise UnknownFilterError("Filtro inválido.")
+
+    column = field.column
+    if operator == EQ:
+        clause = column == _convert(field, value)
+    elif operator == IN:
+        values = [_convert(field, item) for item in value.split(",") if item]
+        if not values or len(values) > MAX_IN_VALUES:
+            raise UnknownFilterError("Valor de filtro inválido.")
+        clause = column.in_(values)
+    elif operator == PREFIX:
+        if not value:
+            raise UnknownFilterError("Valor de filtro inválido.")
+        # A range instead of LIKE, so the index is used whatever the collation
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        clause = and_(column >= value, column < upper)
+    else:
+        value = _convert(field, value)
+        clause = {"gt": column > value, "gte": column >= value, "lt": column < value, "lte": column <= value}[operator]
+
+    if field.via is not None:
+        key = field.key if field.key is not None else column.class_.id
+        return field.via.in_(select(key).where(clause))
+    return clause
@@ -1,25 +1,305 @@
+import re
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from itertools import batched
+
+from sqlalchemy import Row, column, delete, func, literal, literal_column, or_, table, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import contains_eager, joinedload
 from sqlmodel import select
 
-from app.domain.models import Card, Edition, Pokedex
+from app.core.migrations import rebuild_pokedex_stats
+from app.domain.models import Card, Edition, Job, Pokedex, PokedexEntry
+from app.domain.schemas import JobStatus
 
 from .base import Repository
+from .filters import EQ, IN, PREFIX, RANGE, FilterField
+
+# Full-text index of cards on SQLite, created by migration 0002: rowid is the card id
+card_search = table("card_search", column("rowid"))
+SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+# Completion statistics on SQLite, maintained by the triggers of migration 0004
+pokedex_stats = table("pokedex_stats", column("pokedex_id"), column("edition_id"), column("rarity"), column("owned"))
+edition_stats = table("edition_stats", column("edition_id"), column("rarity"), column("cards"))
+
+# INSERT statements supporting ON CONFLICT DO NOTHING, by dialect
+INSERT = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
 
 
 class CardRepository(Repository[Card]):
+    default_options = (joinedload(Card.edition),)
+    filter_fields = {
+        "name": FilterField(Card.name, frozenset({EQ, IN, PREFIX, *RANGE})),
+        "rarity": FilterField(Card.rarity),
+        "edition_id": FilterField(Card.edition_id),
+        "edition_code": FilterField(Edition.code, frozenset({EQ, IN, PREFIX}), via=Card.edition_id),
+        "pokedex_id": FilterField(PokedexEntry.pokedex_id, via=Card.id, key=PokedexEntry.card_id),
+    }
+    projections = {
+        "listing": {
+            "id": Card.id,
+            "card_id": Card.card_id,
+            "set_id": Card.set_id,
+            "name": Card.name,
+            "rarity": Card.rarity,
+            "edition_code": Edition.code,
+            "edition_name": Edition.name,
+        },
+        "export": {
+            "id": Card.id,
+            "card_id": Card.card_id,
+            "set_id": Card.set_id,
+            "name": Card.name,
+            "rarity": Card.rarity,
+            "edition_id": Card.edition_id,
+            "edition_code": Edition.code,
+            "edition_name": Edition.name,
+            "edition_year": Edition.year,
+        },
+    }
+
     def get_by_identifiers(self, card_id: str, set_id: str, edition_slug: str) -> Card:
         stmt = (
             select(self._entity)
+            .join(self._entity.edition)
+            .where(Edition.code == edition_slug)
             .where(self._entity.card_id == card_id)
             .where(self._entity.set_id == set_id)
-            .where(self._entity.edition.has(Edition.code == edition_slug))
+            .options(contains_eager(self._entity.edition))
         )
         return self._session.exec(stmt).one_or_none()
 
+    def get_many_by_identifiers(
+        self, identifiers: Iterable[tuple[str, str, str]], batch_size: int = 300
+    ) -> dict[tuple[str, str, str], Card]:
+        found = {}
+        for batch in batched(identifiers, batch_size):
+            stmt = (
+                select(self._entity)
+                .join(self._entity.edition)
+                .where(tuple_(self._entity.card_id, self._entity.set_id, Edition.code).in_(batch))
+                .options(contains_eager(self._entity.edition))
+            )
+            for card in self._session.exec(stmt).all():
+                found[(card.card_id, card.set_id, card.edition.code)] = card
+        return found
+
+    def get_many_by_keys(
+        self, keys: Iterable[tuple[int, str, str]], batch_size: int = 300
+    ) -> dict[tuple[int, str, str], Row]:
+        # Name and rarity by (edition_id, card_id, set_id), read as plain rows: nothing is loaded in the session.
+        # Looked up by edition and card_id, a prefix of the natural key index: SQLite scans the whole table
+        # when given a long list of (edition_id, card_id, set_id) row values instead
+        keys = set(keys)
+        card_ids: dict[int, set[str]] = {}
+        for edition_id, card_id, _ in keys:
+            card_ids.setdefault(edition_id, set()).add(card_id)
+
+        found = {}
+        columns = (self._entity.edition_id, self._entity.card_id, self._entity.set_id)
+        for edition_id, ids in card_ids.items():
+            for batch in batched(ids, batch_size):
+                stmt = select(*columns, self._entity.name, self._entity.rarity).where(
+                    self._entity.edition_id == edition_id, self._entity.card_id.in_(batch)
+                )
+                for row in self._session.exec(stmt).all():
+                    key = (row.edition_id, row.card_id, row.set_id)
+                    if key in keys:
+                        found[key] = row
+        return found
+
+    def upsert_many(self, rows: Sequence[dict]) -> None:
+        # One INSERT ... ON CONFLICT DO UPDATE on the natural key, run with executemany: on the table rather than
+        # the entity, so rows are handed to the driver as they are instead of being compiled into a bind per value
+        if not rows:
+            return
+        stmt = INSERT[self._session.get_bind().dialect.name](self._entity.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["edition_id", "card_id", "set_id"],
+            set_={"name": stmt.excluded.name, "rarity": stmt.excluded.rarity},
+        )
+        self._session.exec(stmt, params=rows)
+        self._invalidate_counts()
+
+    def search(
+        self,
+        query: str,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        with_total: bool = True,
+        projection: str = "listing",
+    ) -> tuple[list[Row], int | None]:
+        # Every word must match the start of a word of the name, rarity or edition of the card
+        terms = SEARCH_TERM.findall(query.lower())[:MAX_SEARCH_TERMS]
+        if not terms:
+            return [], 0 if with_total else None
+
+        if self._session.get_bind().dialect.name == "sqlite":
+            index = literal_column("card_search")
+            match = index.op("MATCH")(" ".join(f'"{term}"*' for term in terms))
+            stmt = (
+                self._select(None, projection)
+                .join(card_search, card_search.c.rowid == self._entity.id)
+                .where(match)
+                # Ranked by relevance, a name match weighing most
+                .order_by(func.bm25(index, 10.0, 1.0, 4.0, 4.0), self._entity.id)
+            )
+            count_stmt = select(func.count()).select_from(card_search).where(match)
+        else:
+            conditions = [
+                or_(
+                    self._entity.name.ilike(f"%{term}%"),
+                    self._entity.rarity.ilike(f"%{term}%"),
+                    self._entity.edition.has(or_(Edition.name.ilike(f"%{term}%"), Edition.code.ilike(f"%{term}%"))),
+                )
+                for term in terms
+            ]
+            stmt = self._select(None, projection).where(*conditions).order_by(self._entity.name, self._entity.id)
+            count_stmt = select(func.count()).select_from(self._entity).where(*conditions)
+
+        total = self._session.exec(count_stmt).one() if with_total else None
+        rows = self._session.exec(stmt.offset(skip).limit(limit)).all()
+        return rows, total
+
 
 class EditionRepository(Repository[Edition]):
+    filter_fields = {
+        "code": FilterField(Edition.code, frozenset({EQ, IN, PREFIX})),
+        "name": FilterField(Edition.name, frozenset({EQ, IN, PREFIX, *RANGE})),
+    }
+    projections = {
+        "listing": {
+            "id": Edition.id,
+            "code": Edition.code,
+            "name": Edition.name,
+            "year": Edition.year,
+        },
+    }
+
     def get_by_code(self, code: str) -> Edition:
         stmt = select(self._entity).where(self._entity.code == code)
         return self._session.exec(stmt).one_or_none()
 
 
-class PokedexRepository(Repository[Pokedex]): ...
+class PokedexRepository(Repository[Pokedex]):
+    projections = {
+        "listing": {
+            "id": Pokedex.id,
+            "name": Pokedex.name,
+        },
+    }
+
+    def add_cards(self, pokedex_id: int, card_ids: Iterable[int], batch_size: int = 500) -> tuple[int, list[int]]:
+        # One lookup and one INSERT ... SELECT ... ON CONFLICT DO NOTHING per batch; cards already in it are skipped
+        insert = INSERT[self._session.get_bind().dialect.name]
+        added, missing = 0, []
+        for batch in batched(dict.fromkeys(card_ids), batch_size):
+            found = set(self._session.exec(select(Card.id).where(Card.id.in_(batch))).all())
+            missing += [card_id for card_id in batch if card_id not in found]
+            if found:
+                cards = select(literal(pokedex_id), Card.id).where(Card.id.in_(found))
+                stmt = insert(PokedexEntry).from_select(["pokedex_id", "card_id"], cards).on_conflict_do_nothing()
+                added += self._session.exec(stmt).rowcount
+        self._invalidate_counts(Card)
+        return added, missing
+
+    def remove_cards(self, pokedex_id: int, card_ids: Iterable[int], batch_size: int = 500) -> int:
+        removed = 0
+        for batch in batched(dict.fromkeys(card_ids), batch_size):
+            stmt = delete(PokedexEntry).where(PokedexEntry.pokedex_id == pokedex_id, PokedexEntry.card_id.in_(batch))
+            removed += self._session.exec(stmt).rowcount
+        self._invalidate_counts(Card)
+        return removed
+
+    def get_stats(self, pokedex_id: int) -> tuple[list[Row], list[Row]]:
+        # Cards owned by edition and rarity, and cards of those editions by rarity
+        if self._session.get_bind().dialect.name == "sqlite":
+            owned_stmt = (
+                select(
+                    pokedex_stats.c.edition_id,
+                    Edition.code.label("edition_code"),
+                    Edition.name.label("edition_name"),
+                    pokedex_stats.c.rarity,
+                    pokedex_stats.c.owned,
+                )
+                .select_from(pokedex_stats.join(Edition, Edition.id == pokedex_stats.c.edition_id))
+                .where(pokedex_stats.c.pokedex_id == pokedex_id)
+            )
+            editions = select(pokedex_stats.c.edition_id).where(pokedex_stats.c.pokedex_id == pokedex_id)
+            totals_stmt = select(edition_stats.c.edition_id, edition_stats.c.rarity, edition_stats.c.cards).where(
+                edition_stats.c.edition_id.in_(editions)
+            )
+        else:
+            owned_stmt = (
+                select(
+                    Card.edition_id,
+                    Edition.code.label("edition_code"),
+                    Edition.name.label("edition_name"),
+                    Card.rarity,
+                    func.count().label("owned"),
+                )
+                .select_from(PokedexEntry)
+                .join(Card, Card.id == PokedexEntry.card_id)
+                .join(Edition, Edition.id == Card.edition_id)
+                .where(PokedexEntry.pokedex_id == pokedex_id)
+                .group_by(Card.edition_id, Edition.code, Edition.name, Card.rarity)
+            )
+            editions = (
+                select(Card.edition_id)
+                .join(PokedexEntry, PokedexEntry.card_id == Card.id)
+                .where(PokedexEntry.pokedex_id == pokedex_id)
+            )
+            totals_stmt = (
+                select(Card.edition_id, Card.rarity, func.count().label("cards"))
+                .where(Card.edition_id.in_(editions))
+                .group_by(Card.edition_id, Card.rarity)
+            )
+
+        return self._session.exec(owned_stmt).all(), self._session.exec(totals_stmt).all()
+
+    def rebuild_stats(self) -> tuple[int, int]:
+        if self._session.get_bind().dialect.name != "sqlite":
+            return 0, 0
+        return rebuild_pokedex_stats(self._session.connection())
+
+
+class JobRepository(Repository[Job]):
+    def claim_next(self, now: datetime) -> Job | None:
+        # A single UPDATE picks and locks the job, so concurrent workers never claim the same one
+        due = (
+            select(self._entity.id)
+            .where(self._entity.status == JobStatus.QUEUED, self._entity.run_after <= now)
+            .order_by(self._entity.run_after, self._entity.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(self._entity)
+            .where(self._entity.id == due, self._entity.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, attempts=self._entity.attempts + 1, locked_at=now, updated_at=now)
+            .returning(self._entity.id)
+        )
+        job_id = self._session.exec(stmt).scalar_one_or_none()
+        if job_id is None:
+            return None
+        return self._session.get(self._entity, job_id, populate_existing=True)
+
+    def heartbeat(self, id: int, now: datetime) -> bool:
+        # A job no longer running (requeued as stale meanwhile) is left to the worker that claims it again
+        stmt = (
+            update(self._entity)
+            .where(self._entity.id == id, self._entity.status == JobStatus.RUNNING)
+            .values(locked_at=now)
+        )
+        return self._session.exec(stmt).rowcount > 0
+
+    def requeue_stale(self, locked_before: datetime) -> int:
+        stmt = (
+            update(self._entity)
+            .where(self._entity.status == JobStatus.RUNNING, self._entity.locked_at < locked_before)
+            .values(status=JobStatus.QUEUED, locked_at=None)
+        )
+        return self._session.exec(stmt).rowcount
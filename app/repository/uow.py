@@ -1,8 +1,10 @@
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.domain.models import Card, Edition, Pokedex
+from app.domain.models import Card, Edition, Job, Pokedex
 
-from .repositories import CardRepository, EditionRepository, PokedexRepository
+from .base import AsyncRepository
+from .repositories import CardRepository, EditionRepository, JobRepository, PokedexRepository
 
 
 class UnitOfWork:
@@ -10,6 +12,7 @@ class UnitOfWork:
         self.cards = CardRepository(session, Card)
         self.editions = EditionRepository(session, Edition)
         self.pokedexes = PokedexRepository(session, Pokedex)
+        self.jobs = JobRepository(session, Job)
         self.session = session
 
     def commit(self):
@@ -25,5 +28,34 @@ class UnitOfWork:
             return self.editions
         elif entity_type == Pokedex:
             return self.pokedexes
+        elif entity_type == Job:
+            return self.jobs
+        else:
+            raise ValueError("Unknown entity type for repository retrieval.")
+
+
+class AsyncUnitOfWork:
+    def __init__(self, session: AsyncSession):
+        self.cards = AsyncRepository(session, CardRepository, Card)
+        self.editions = AsyncRepository(session, EditionRepository, Edition)
+        self.pokedexes = AsyncRepository(session, PokedexRepository, Pokedex)
+        self.jobs = AsyncRepository(session, JobRepository, Job)
+        self.session = session
+
+    async def commit(self):
+        await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
+
+    def get_repository(self, entity_type: type) -> AsyncRepository:
+        if entity_type == Card:
+            return self.cards
+        elif entity_type == Edition:
+            return self.editions
+        elif entity_type == Pokedex:
+            return self.pokedexes
+        elif entity_type == Job:
+            return self.jobs
         else:
             raise ValueError("Unknown entity type for repository retrieval.")
@@ -1,7 +1,23 @@
 """Service package initialization."""
 
 from .card_service import CardService
+from .edition_cache import EditionCache, edition_cache
 from .edition_service import EditionService
-from .exceptions import ObjectNotFoundError
+from .exceptions import ObjectNotFoundError, UnknownJobKindError
+from .job_service import JobService, job_handler
+from .job_worker import JobWorkerPool, job_worker_pool
+from .pokedex_service import PokedexService
 
-__all__ = ["CardService", "EditionService", "ObjectNotFoundError"]
+__all__ = [
+    "CardService",
+    "EditionCache",
+    "EditionService",
+    "JobService",
+    "JobWorkerPool",
+    "ObjectNotFoundError",
+    "PokedexService",
+    "UnknownJobKindError",
+    "edition_cache",
+    "job_handler",
+    "job_worker_pool",
+]
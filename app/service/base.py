@@ -1,13 +1,15 @@
 import abc
+from collections.abc import AsyncIterator, Sequence
 from typing import TypeVar
 
 from pydantic import BaseModel
-from sqlmodel import Session
+from sqlalchemy import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
 from traitlets import Any
 
 from app.core.db import Model
 from app.libs import LigaPokemon
-from app.repository import UnitOfWork
+from app.repository import AsyncUnitOfWork
 from app.service.exceptions import ObjectNotFoundError
 
 Entity = TypeVar("Entity", bound=Model)
@@ -20,16 +22,16 @@ class BaseService[Entity, Input](abc.ABC):
     def __init__(
         self,
         *,
-        session: Session,
+        session: AsyncSession,
         liga: LigaPokemon,
         entity_type: type[Entity],
-        uow: UnitOfWork | None = None,
+        uow: AsyncUnitOfWork | None = None,
         fields_to_update: set[str] | None = None,
         immutable_fields: set[str] | None = None,
     ) -> None:
         """Initialize a BaseService instance."""
         self.liga = liga
-        self.uow = uow or UnitOfWork(session)
+        self.uow = uow or AsyncUnitOfWork(session)
         self.entity_type = entity_type
         self.fields_to_update = fields_to_update
         self.immutable_fields = immutable_fields or {
@@ -76,7 +78,7 @@ class BaseService[Entity, Input](abc.ABC):
 
         return set(self.entity_type.model_fields.keys())
 
-    def create(self, *, data: Input, commit: bool = True) -> Entity:
+    async def create(self, *, data: Input, commit: bool = True) -> Entity:
         """Create a new entity.
 
         :param data: Input data for the new entity
@@ -84,14 +86,14 @@ class BaseService[Entity, Input](abc.ABC):
         :return: The created entity
         """
         entity = self._to_entity(data)
-        entity = self.uow.get_repository(self.entity_type).save(entity)
+        entity = await self.uow.get_repository(self.entity_type).save(entity)
 
         if commit:
-            self.uow.commit()
+            await self.uow.commit()
 
         return entity
 
-    def update(self, id: int, data: Input, commit: bool = True) -> Entity:
+    async def update(self, id: int, data: Input, commit: bool = True) -> Entity:
         """Update an existing entity.
 
         :param id: The ID of the entity to update
@@ -100,60 +102,119 @@ class BaseService[Entity, Input](abc.ABC):
         :return: The updated entity
         """
         repository = self.uow.get_repository(self.entity_type)
-        entity = repository.get_by_id(id)
+        entity = await repository.get_by_id(id)
 
         if entity is None:
             raise ObjectNotFoundError("Entity not found.")
 
         entity = self._update_entity(entity, data)
-        repository.save(entity)
+        await repository.save(entity)
 
         if commit:
-            self.uow.commit()
+            await self.uow.commit()
 
         return entity
 
-    def delete(self, id: int, commit: bool = True) -> None:
+    async def delete(self, id: int, commit: bool = True) -> None:
         """Delete an entity by its ID.
 
         :param id: The ID of the entity to delete
         :param commit: Whether to commit the transaction
         """
         repository = self.uow.get_repository(self.entity_type)
-        entity = repository.get_by_id(id)
+        entity = await repository.get_by_id(id)
 
         if entity is None:
             raise ObjectNotFoundError("Entity not found.")
 
-        repository.remove(id)
+        await repository.remove(id)
 
         if commit:
-            self.uow.commit()
+            await self.uow.commit()
 
-    def get_by_id(self, id: int) -> Entity:
+    async def get_by_id(self, id: int) -> Entity:
         """Retrieve an entity by its ID.
 
         :param id: The ID of the entity to retrieve
         :return: The entity
         """
-        entity = self.uow.get_repository(self.entity_type).get_by_id(id)
+        entity = await self.uow.get_repository(self.entity_type).get_by_id(id)
         if entity is None:
             raise ObjectNotFoundError("Entity not found.")
         return entity
 
-    def get_list(
+    async def get_list(
         self,
         *,
         page: int = 1,
         page_size: int = 100,
-    ) -> tuple[list[Entity], int]:
+        include_total: bool = True,
+        projection: str | None = None,
+        filters: dict[str, str] | None = None,
+        sort: str = "id",
+    ) -> tuple[list[Entity] | list[Row], int | None]:
         """Retrieve a list of entities with optional filtering and pagination.
 
-        :param filters: A dictionary of filters to apply
         :param page: The page number for pagination
         :param page_size: The number of items per page
+        :param include_total: Whether to count the entities
+        :param projection: Name of a repository projection to read immutable rows of, instead of entities
+        :param filters: Filters of the repository query language (app.repository.filters)
+        :param sort: Field to sort by, prefixed with - for descending order
         :return: A tuple containing the list of entities and the total count
         """
         skip = (page - 1) * page_size
         limit = page_size
-        return self.uow.get_repository(self.entity_type).list(skip=skip, limit=limit)
+        return await self.uow.get_repository(self.entity_type).list(
+            skip=skip, limit=limit, with_total=include_total, projection=projection, filters=filters, sort=sort
+        )
+
+    async def get_list_by_cursor(
+        self,
+        *,
+        cursor: str | None = None,
+        page_size: int = 100,
+        include_total: bool = True,
+        projection: str | None = None,
+        filters: dict[str, str] | None = None,
+        sort: str = "id",
+    ) -> tuple[list[Entity] | list[Row], int | None, str | None, str | None]:
+        """Retrieve a page of entities by keyset, so deep pages cost the same as the first.
+
+        :param cursor: Cursor returned by a previous page, None for the first page
+        :param page_size: The number of items per page
+        :param include_total: Whether to count the entities
+        :param projection: Name of a repository projection to read immutable rows of, instead of entities
+        :param filters: Filters of the repository query language (app.repository.filters)
+        :param sort: Field to sort by, prefixed with - for descending order
+        :return: A tuple containing the list of entities, the total count and the next and previous cursors
+        """
+        repository = self.uow.get_repository(self.entity_type)
+        items, next_cursor, prev_cursor = await repository.list_keyset(
+            cursor=cursor, limit=page_size, projection=projection, filters=filters, sort=sort
+        )
+        total = await repository.count(filters=filters) if include_total else None
+        return items, total, next_cursor, prev_cursor
+
+    async def stream_rows(
+        self,
+        *,
+        projection: str,
+        filters: dict[str, str] | None = None,
+        sort: str = "id",
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Open a server-side cursor over every row of a projection, read in batches.
+
+        The query is validated and started here, so bad filters raise before
+        anything is streamed; only one batch is held in memory at a time.
+
+        :param projection: Name of a repository projection
+        :param filters: Filters of the repository query language (app.repository.filters)
+        :param sort: Field to sort by, prefixed with - for descending order
+        :param batch_size: Number of rows fetched from the cursor at a time
+        :return: Async iterator of batches of rows
+        """
+        stmt = await self.uow.get_repository(self.entity_type).select_rows(projection, filters=filters, sort=sort)
+        result = await self.uow.session.stream(stmt.execution_options(yield_per=batch_size))
+        return result.partitions()
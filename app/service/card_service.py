@@ -1,27 +1,61 @@
-from app.domain.models import Card
-from app.domain.schemas import CardInput
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import Card, Edition
+from app.domain.schemas import (
+    CardBulkStatus,
+    CardInput,
+    CardLoad,
+    CardResponse,
+    EditionLoad,
+    EditionResponse,
+    EditionSyncReport,
+)
+from app.libs.images import ImageDownloader
 from app.libs.ligapokemon import LigaPokemon
+from app.repository.uow import AsyncUnitOfWork
 
 from .base import BaseService
 from .edition_service import EditionService
+from .job_service import job_handler
+
+# Fields read from each imported row, named as GET /cards/export writes them; ids are never imported
+IMPORT_FIELDS = ("card_id", "set_id", "name", "rarity", "edition_code", "edition_name", "edition_year")
 
 
 class CardService(BaseService[Card, CardInput]):
     """Service class for card-related operations."""
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        *,
+        session: AsyncSession,
+        liga: LigaPokemon | None = None,
+        uow: AsyncUnitOfWork | None = None,
+    ) -> None:
         """Initialize a CardService instance.
 
-        :param args: Positional arguments
-        :param kwargs: Keyword arguments
+        :param session: Database session
+        :param liga: Scraper used to load card data
+        :param uow: Unit of work shared with other services
         """
-        kwargs.update({"liga": LigaPokemon()})
-        super().__init__(*args, **kwargs)
-        self.edition_service = EditionService(*args, **kwargs)
+        super().__init__(
+            session=session,
+            liga=liga or LigaPokemon(),
+            entity_type=Card,
+            uow=uow,
+        )
+        self.edition_service = EditionService(session=session, liga=self.liga, uow=self.uow)
 
-    def _to_entity(self, data: CardInput) -> Card:
-        """Convert CardInput data to a Card entity.
-        :param data: CardInput data
+    def _to_entity(self, data: CardLoad) -> Card:
+        """Convert CardLoad data to a Card entity.
+        :param data: CardLoad data
         :return: Card entity
         """
         return Card.model_validate(
@@ -44,15 +78,13 @@ class CardService(BaseService[Card, CardInput]):
         entity.rarity = data.rarity
         return entity
 
-    def create(self, *, data: CardInput, commit: bool = True) -> Card:
+    async def create(self, *, data: CardInput, commit: bool = True) -> Card:
         """Create a Pokémon card.
 
         :param data: CardInput object containing card_id, set_id, and edition
         :return: CardLoad object with card details
         """
-        card_loaded = self.liga.get_card(data.card_id, data.set_id, data.edition_slug)
-
-        card = self.uow.cards.get_by_identifiers(
+        card = await self.uow.cards.get_by_identifiers(
             card_id=data.card_id, set_id=data.set_id, edition_slug=data.edition_slug
         )
 
@@ -60,14 +92,369 @@ class CardService(BaseService[Card, CardInput]):
             # Card already exists
             return card
 
-        edition = self.edition_service.get_or_create_edition(data.edition_slug, commit=False)
+        card_loaded = await self.liga.get_card(data.card_id, data.set_id, data.edition_slug)
+
+        edition = await self.edition_service.get_or_create_edition(data.edition_slug, commit=False)
 
-        card_loaded.update({"edition_id": edition.id})
+        card_loaded.edition_id = edition.id
         card = self._to_entity(data=card_loaded)
+        card.edition = edition
 
-        card = self.uow.cards.save(card)
+        card = await self.uow.cards.save(card)
 
         if commit:
-            self.uow.commit()
+            await self.uow.commit()
 
         return card
+
+    async def create_bulk(
+        self, *, items: list[CardInput], commit: bool = True
+    ) -> list[tuple[CardInput, CardBulkStatus, Card | None, str | None]]:
+        """Create many Pokémon cards in a single transaction.
+
+        Duplicated items are reported once, cards already stored are not
+        scraped again and the missing ones are scraped concurrently, bounded
+        by the fetcher pools. A failed scrape only fails its own item.
+
+        :param items: CardInput objects to create
+        :param commit: Whether to commit the transaction
+        :return: Tuples of (item, status, card, error) in the same order as the items
+        """
+        unique = {}
+        for item in items:
+            unique.setdefault(item.identifiers, item)
+
+        existing = await self.uow.cards.get_many_by_identifiers(unique.keys())
+        missing = [key for key in unique if key not in existing]
+
+        scraped = await LigaPokemon.get_cards(missing, fetcher=self.liga.fetcher)
+
+        editions: dict[str, Edition] = {}
+        created: dict[tuple[str, str, str], Card] = {}
+        errors: dict[tuple[str, str, str], str] = {}
+
+        for key, result in zip(missing, scraped, strict=True):
+            if isinstance(result, Exception):
+                errors[key] = str(result) or type(result).__name__
+                continue
+
+            card_loaded, edition_loaded = result
+            edition_slug = key[2]
+            if edition_slug not in editions:
+                editions[edition_slug] = await self.edition_service.get_or_create_edition(
+                    edition_slug, commit=False, data=edition_loaded
+                )
+
+            card_loaded.edition_id = editions[edition_slug].id
+            card = self._to_entity(data=card_loaded)
+            card.edition = editions[edition_slug]
+            created[key] = card
+
+        await self.uow.cards.save_all(list(created.values()))
+
+        if commit:
+            await self.uow.commit()
+
+        results = []
+        reported = set()
+        for item in items:
+            key = item.identifiers
+            if key in reported:
+                results.append((item, CardBulkStatus.DUPLICATE, None, None))
+                continue
+
+            reported.add(key)
+            if key in existing:
+                results.append((item, CardBulkStatus.EXISTING, existing[key], None))
+            elif key in created:
+                results.append((item, CardBulkStatus.CREATED, created[key], None))
+            else:
+                results.append((item, CardBulkStatus.FAILED, None, errors.get(key)))
+
+        return results
+
+    async def sync_edition(self, *, edition_slug: str, batch_size: int = 500) -> tuple[Edition, Counter]:
+        """Crawl the listing pages of an edition and upsert every card it lists.
+
+        The edition is created if needed, then its cards are written in
+        batches, each one looked up with a single query and committed on its
+        own: new cards are created, cards whose name or rarity changed are
+        updated and the rest are left untouched.
+
+        :param edition_slug: Edition code
+        :param batch_size: Number of cards written per transaction
+        :return: The edition and the number of cards by outcome (listed, created, updated, unchanged, duplicate)
+        """
+        edition_loaded, cards_loaded = await self.liga.get_edition_cards(edition_slug)
+        edition = await self.edition_service.get_or_create_edition(edition_slug, data=edition_loaded)
+
+        unique: dict[tuple[str, str, str], CardLoad] = {}
+        for card_loaded in cards_loaded:
+            unique.setdefault((card_loaded.card_id, card_loaded.set_id, edition_slug), card_loaded)
+
+        totals = Counter(listed=len(cards_loaded), duplicate=len(cards_loaded) - len(unique))
+
+        for batch in batched(unique.items(), batch_size):
+            existing = await self.uow.cards.get_many_by_identifiers(key for key, _ in batch)
+            changed = []
+
+            for key, card_loaded in batch:
+                card = existing.get(key)
+                if card is None:
+                    card_loaded.edition_id = edition.id
+                    card = self._to_entity(data=card_loaded)
+                    card.edition = edition
+                    totals["created"] += 1
+                elif (card.name, card.rarity) != (card_loaded.name, card_loaded.rarity or card.rarity):
+                    card.name = card_loaded.name
+                    card.rarity = card_loaded.rarity or card.rarity
+                    totals["updated"] += 1
+                else:
+                    totals["unchanged"] += 1
+                    continue
+                changed.append(card)
+
+            await self.uow.cards.save_all(changed)
+            await self.uow.commit()
+
+        return edition, totals
+
+    async def import_cards(
+        self, *, rows: AsyncIterable[tuple[int, dict | None]], batch_size: int = 1000
+    ) -> AsyncIterator[tuple[Counter, list[tuple[int, str]]]]:
+        """Import cards from the rows of a file, upserting them in batches.
+
+        Rows with a name and rarity are written as they are: only the rows
+        lacking them are scraped. An edition neither stored nor described by
+        the row is resolved by scraping a single of its rows per set, and
+        editions are resolved once per code: the rows of an edition that
+        could not be resolved fail for the rest of the run without being
+        scraped again. Each batch is looked up with one query, written with one multi-row upsert and
+        committed on its own, so memory is bounded by the batch size.
+
+        :param rows: Line number and fields of each row, fields being None when the line could not be read
+        :param batch_size: Number of rows written per transaction
+        :return: Async iterator of the running totals and the errors of each batch, as (line, error)
+        """
+        editions: dict[str, int | None] = {}
+        unresolved: dict[str, str] = {}
+        totals = Counter()
+        batch = []
+
+        async for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield totals, await self._import_batch(batch, editions, unresolved, totals)
+                batch = []
+
+        if batch:
+            yield totals, await self._import_batch(batch, editions, unresolved, totals)
+
+    async def _import_batch(
+        self,
+        batch: list[tuple[int, dict | None]],
+        editions: dict[str, int | None],
+        unresolved: dict[str, str],
+        totals: Counter,
+    ) -> list[tuple[int, str]]:
+        """Validate, complete and upsert one batch of imported rows, then commit it.
+
+        :param batch: Line number and fields of each row
+        :param editions: Edition ids by code resolved so far, None for the unknown ones
+        :param unresolved: Error of each edition code scraping failed to resolve so far in the run
+        :param totals: Running totals, updated in place
+        :return: The errors of the batch, as (line, error)
+        """
+        totals["read"] += len(batch)
+        errors = []
+        items: dict[tuple[str, str, str], tuple[int, CardLoad | None]] = {}
+
+        for line, fields in batch:
+            if fields is None:
+                errors.append((line, "Linha inválida."))
+                continue
+
+            values = {name: None if fields.get(name) in (None, "") else str(fields[name]) for name in IMPORT_FIELDS}
+            absent = [name for name in ("card_id", "set_id", "edition_code") if values[name] is None]
+            if absent:
+                errors.append((line, f"Campos obrigatórios ausentes: {', '.join(absent)}."))
+                continue
+
+            code = values["edition_code"]
+            identifiers = (values["card_id"], values["set_id"], code)
+            if identifiers in items:
+                totals["duplicate"] += 1
+                continue
+            card_loaded = CardLoad.model_validate(values) if values["name"] and values["rarity"] else None
+            items[identifiers] = (line, card_loaded)
+
+            if editions.get(code) is None and (code not in editions or values["edition_name"]):
+                edition = await self.edition_service.get_by_code(code)
+                if edition is None and values["edition_name"] and values["edition_year"]:
+                    data = EditionLoad(code=code, name=values["edition_name"], year=values["edition_year"])
+                    edition = await self.edition_service.get_or_create_edition(code, commit=False, data=data)
+                editions[code] = edition.id if edition else None
+
+        # An edition scraping failed to resolve in an earlier batch is not tried again
+        for identifiers, (line, _) in list(items.items()):
+            code = identifiers[2]
+            if editions[code] is None and code in unresolved:
+                errors.append((line, unresolved[code]))
+                del items[identifiers]
+
+        existing = await self.uow.cards.get_many_by_keys(
+            (editions[code], card_id, set_id) for card_id, set_id, code in items if editions[code] is not None
+        )
+
+        # Only the new rows lacking data are scraped, a stored card lacking data is left as it is. An unknown
+        # edition is resolved by scraping one of its rows per set, the others keep their own data.
+        missing = [
+            (card_id, set_id, code)
+            for (card_id, set_id, code), (_, card_loaded) in items.items()
+            if card_loaded is None and (editions[code], card_id, set_id) not in existing
+        ]
+        resolving = {(code, set_id) for _, set_id, code in missing}
+        for card_id, set_id, code in items:
+            if editions[code] is None and (code, set_id) not in resolving:
+                resolving.add((code, set_id))
+                missing.append((card_id, set_id, code))
+        scraped = await LigaPokemon.get_cards(missing, fetcher=self.liga.fetcher) if missing else []
+
+        failures = {}
+        for identifiers, result in zip(missing, scraped, strict=True):
+            line, card_loaded = items[identifiers]
+            if isinstance(result, Exception):
+                failures[identifiers[2]] = str(result) or type(result).__name__
+                if card_loaded is None:
+                    errors.append((line, failures[identifiers[2]]))
+                    del items[identifiers]
+                continue
+
+            scraped_card, edition_loaded = result
+            code = identifiers[2]
+            if editions[code] is None:
+                edition = await self.edition_service.get_or_create_edition(code, commit=False, data=edition_loaded)
+                editions[code] = edition.id
+            items[identifiers] = (line, card_loaded or scraped_card)
+            # Rows with their own data were only scraped for their edition
+            totals["scraped" if card_loaded is None else "edition_lookups"] += 1
+
+        for identifiers, (line, _) in list(items.items()):
+            code = identifiers[2]
+            if editions[code] is None:
+                unresolved[code] = failures.get(code, "Edição não encontrada.")
+                errors.append((line, unresolved[code]))
+                del items[identifiers]
+
+        rows = []
+        for (card_id, set_id, code), (_, card_loaded) in items.items():
+            current = existing.get((editions[code], card_id, set_id))
+            loaded = None if card_loaded is None else (card_loaded.name, card_loaded.rarity)
+            if loaded is None or current and (current.name, current.rarity) == loaded:
+                totals["unchanged"] += 1
+                continue
+
+            totals["updated" if current else "created"] += 1
+            rows.append(
+                {
+                    "edition_id": editions[code],
+                    "card_id": card_id,
+                    "set_id": set_id,
+                    "name": card_loaded.name,
+                    "rarity": card_loaded.rarity,
+                }
+            )
+
+        await self.uow.cards.upsert_many(rows)
+        await self.uow.commit()
+
+        totals["failed"] += len(errors)
+        return errors
+
+    async def search(
+        self,
+        *,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+    ) -> tuple[list[Row], int | None]:
+        """Search cards by name, rarity and edition name or code, best matches first.
+
+        Every word of the query must prefix a word of the card, so partial
+        words typed so far already match.
+
+        :param query: Words to search for
+        :param page: The page number for pagination
+        :param page_size: The number of items per page
+        :param include_total: Whether to count the matching cards
+        :return: A tuple containing the listing rows of the cards and the total count
+        """
+        return await self.uow.cards.search(
+            query, skip=(page - 1) * page_size, limit=page_size, with_total=include_total
+        )
+
+    async def sync_images(self, *, downloader: ImageDownloader, batch_size: int = 200) -> Counter:
+        """Download the image of every card into the downloader directory, named by Card.image_name.
+
+        Cards are read in keyset batches, images already downloaded and
+        unchanged are skipped before their page is even looked at, and the
+        rest are streamed concurrently.
+
+        :param downloader: Open image downloader
+        :param batch_size: Number of cards read at a time
+        :return: Number of cards by outcome
+        """
+        totals = Counter()
+        cursor = None
+
+        while True:
+            cards, cursor, _ = await self.uow.cards.list_keyset(cursor=cursor, limit=batch_size)
+
+            current = await asyncio.gather(*(asyncio.to_thread(downloader.is_current, c.image_name) for c in cards))
+            pending = [card for card, is_current in zip(cards, current, strict=True) if not is_current]
+            totals["skipped"] += len(cards) - len(pending)
+
+            urls = await asyncio.gather(
+                *(
+                    LigaPokemon(fetcher=self.liga.fetcher).get_image_url(card.card_id, card.set_id, card.edition.code)
+                    for card in pending
+                ),
+                return_exceptions=True,
+            )
+
+            items = []
+            for card, url in zip(pending, urls, strict=True):
+                if isinstance(url, Exception) or url is None:
+                    totals["no_image"] += 1
+                else:
+                    items.append((url, card.image_name))
+
+            totals.update(await downloader.download_many(items))
+
+            if cursor is None:
+                return totals
+
+
+@job_handler("scrape_card")
+async def scrape_card(session: AsyncSession, payload: dict[str, Any]) -> dict[str, Any]:
+    """Background job: scrape and insert a card, its payload being a CardInput.
+
+    :param session: Database session of the job
+    :param payload: CardInput fields
+    :return: The card, as a CardResponse
+    """
+    card = await CardService(session=session).create(data=CardInput.model_validate(payload))
+    return CardResponse.from_model(card).model_dump()
+
+
+@job_handler("sync_edition")
+async def sync_edition(session: AsyncSession, payload: dict[str, Any]) -> dict[str, Any]:
+    """Background job: crawl and upsert every card of an edition, its payload holding the edition_slug.
+
+    :param session: Database session of the job
+    :param payload: {"edition_slug": ...}
+    :return: The sync report, as an EditionSyncReport
+    """
+    edition, totals = await CardService(session=session).sync_edition(edition_slug=payload["edition_slug"])
+    return EditionSyncReport(edition=EditionResponse.from_model(edition), **totals).model_dump()
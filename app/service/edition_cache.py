@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.settings import settings
+from app.domain.models import Edition
+
+
+class EditionCache:
+    """Process-wide LRU cache of editions by code, with a TTL.
+
+    It holds detached snapshots of committed editions only, so a cached row
+    can be attached to any session without a query (see
+    ``Repository.attach``). Writes through ``EditionService`` invalidate it;
+    the TTL bounds how stale it can get when other processes write.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0) -> None:
+        """Initialize an EditionCache instance.
+
+        :param maxsize: Maximum number of editions kept
+        :param ttl: Seconds an edition is served before being read again
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, tuple[float, Edition]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, code: str) -> Edition | None:
+        """Return the detached snapshot of an edition, or None when not cached or expired.
+
+        :param code: The code of the edition
+        :return: Detached edition snapshot
+        """
+        with self._lock:
+            item = self._items.get(code)
+            if item is None or item[0] < time.monotonic():
+                self._items.pop(code, None)
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(code)
+            self.hits += 1
+            return item[1]
+
+    def put(self, code: str, edition: Edition) -> None:
+        """Cache a snapshot of a committed edition.
+
+        :param code: The code the edition was looked up by
+        :param edition: The edition, in any session state
+        """
+        snapshot = Edition(id=edition.id, name=edition.name, code=edition.code, year=edition.year)
+        make_transient_to_detached(snapshot)
+
+        with self._lock:
+            self._items[code] = (time.monotonic() + self.ttl, snapshot)
+            self._items.move_to_end(code)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, code: str | None = None) -> None:
+        """Drop an edition from the cache, or every edition when no code is given.
+
+        :param code: The code of the edition to drop
+        """
+        with self._lock:
+            if code is None:
+                self._items.clear()
+            else:
+                self._items.pop(code, None)
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Return the cache counters.
+
+        :return: Hits, misses, hit rate and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._items),
+        }
+
+
+edition_cache = EditionCache(maxsize=settings.edition_cache_size, ttl=settings.edition_cache_ttl)
@@ -1,11 +1,12 @@
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.domain.models import Edition
 from app.domain.schemas import EditionLoad
 from app.libs.ligapokemon import LigaPokemon
-from app.repository.uow import UnitOfWork
+from app.repository.uow import AsyncUnitOfWork
 
 from .base import BaseService
+from .edition_cache import EditionCache, edition_cache
 
 
 class EditionService(BaseService[Edition, EditionLoad]):
@@ -14,14 +15,16 @@ class EditionService(BaseService[Edition, EditionLoad]):
     def __init__(
         self,
         *,
-        session: Session,
+        session: AsyncSession,
         liga: LigaPokemon | None = None,
-        uow: UnitOfWork | None = None,
+        uow: AsyncUnitOfWork | None = None,
+        cache: EditionCache | None = None,
     ) -> None:
         """Initialize an EditionService instance.
 
         :param args: Positional arguments
         :param kwargs: Keyword arguments
+        :param cache: Edition lookup cache, defaults to the process-wide one
         """
         super().__init__(
             session=session,
@@ -30,6 +33,7 @@ class EditionService(BaseService[Edition, EditionLoad]):
             fields_to_update={"name", "code", "year"},
             uow=uow,
         )
+        self.cache = cache or edition_cache
 
     def _to_entity(self, data: EditionLoad) -> Edition:
         """Convert EditionLoad data to an Edition entity.
@@ -39,22 +43,76 @@ class EditionService(BaseService[Edition, EditionLoad]):
         """
         return Edition.from_data(data)
 
-    def get_or_create_edition(self, code: str, commit: bool = True) -> Edition:
-        """Retrieve an Edition by its code or create it if it doesn't exist.
+    async def create(self, *, data: EditionLoad, commit: bool = True) -> Edition:
+        """Create a new edition, dropping any cached lookup of its code.
+
+        :param data: Input data for the new edition
+        :param commit: Whether to commit the transaction
+        :return: The created edition
+        """
+        edition = await super().create(data=data, commit=commit)
+        self.cache.invalidate(edition.code)
+        return edition
+
+    async def update(self, id: int, data: EditionLoad, commit: bool = True) -> Edition:
+        """Update an edition, dropping the cached lookups since its code may change.
+
+        :param id: The ID of the edition to update
+        :param data: Input data for updating the edition
+        :param commit: Whether to commit the transaction
+        :return: The updated edition
+        """
+        edition = await super().update(id, data, commit=commit)
+        self.cache.invalidate()
+        return edition
+
+    async def delete(self, id: int, commit: bool = True) -> None:
+        """Delete an edition, dropping the cached lookups.
+
+        :param id: The ID of the edition to delete
+        :param commit: Whether to commit the transaction
+        """
+        await super().delete(id, commit=commit)
+        self.cache.invalidate()
+
+    async def get_by_code(self, code: str) -> Edition | None:
+        """Retrieve an Edition by its code, from the cache when possible.
 
         :param code: The code of the edition to retrieve
         :return: Edition object if found, else None
         """
         repository = self.uow.get_repository(self.entity_type)
-        edition = repository.get_by_code(code)
+
+        cached = self.cache.get(code)
+        if cached is not None:
+            return await repository.attach(cached)
+
+        edition = await repository.get_by_code(code)
+
+        # Only committed rows are cached, so a rollback can never leave a dangling id behind: a transaction
+        # that wrote editions may have read its own, so it leaves caching to the next lookup
+        if edition is not None and not await repository.has_pending_writes():
+            self.cache.put(code, edition)
+
+        return edition
+
+    async def get_or_create_edition(self, code: str, commit: bool = True, data: EditionLoad | None = None) -> Edition:
+        """Retrieve an Edition by its code or create it if it doesn't exist.
+
+        :param code: The code of the edition to retrieve
+        :param commit: Whether to commit the transaction
+        :param data: Edition data already scraped, to avoid reading it from the scraper
+        :return: Edition object if found, else None
+        """
+        edition = await self.get_by_code(code)
 
         if edition is None:
             # Edition does not exist, create it
-            edition_data = self.liga.get_edition()
-            edition = Edition.model_validate(edition_data)
-            edition = repository.save(edition)
+            edition_data = data or await self.liga.get_edition()
+            edition = Edition.from_data(edition_data)
+            edition = await self.uow.get_repository(self.entity_type).save(edition)
 
             if commit:
-                self.uow.commit()
+                await self.uow.commit()
 
         return edition
@@ -1 +1,4 @@
 class ObjectNotFoundError(Exception): ...
+
+
+class UnknownJobKindError(Exception): ...
@@ -0,0 +1,179 @@
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import settings
+from app.domain.models import Job
+from app.domain.models.entities import utcnow
+from app.domain.schemas import JobStatus
+from app.repository.uow import AsyncUnitOfWork
+
+from .exceptions import ObjectNotFoundError
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+# Handler of each job kind, registered with @job_handler
+job_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine as the handler of a job kind.
+
+    The handler gets its own database session and the job payload, and returns
+    the job result. Raising marks the attempt as failed.
+
+    :param kind: Job kind handled
+    :type kind: str
+    :return: Decorator registering the handler
+    :rtype: Callable[[JobHandler], JobHandler]
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+
+    return register
+
+
+class JobService:
+    """Service class for the durable background job queue.
+
+    Jobs are rows of the ``job`` table, so they survive restarts and need no
+    external broker. A failed attempt is retried with exponential backoff
+    until the job runs out of attempts, when it is dead-lettered.
+    """
+
+    def __init__(self, *, session: AsyncSession, uow: AsyncUnitOfWork | None = None) -> None:
+        """Initialize a JobService instance.
+
+        :param session: Database session
+        :param uow: Unit of work shared with other services
+        """
+        self.uow = uow or AsyncUnitOfWork(session)
+
+    async def enqueue(
+        self, kind: str, payload: dict[str, Any], *, max_attempts: int | None = None, commit: bool = True
+    ) -> Job:
+        """Add a job to the queue.
+
+        :param kind: Job kind, which selects its handler
+        :param payload: JSON serializable arguments of the handler
+        :param max_attempts: Attempts before the job is dead-lettered, defaults to the settings
+        :param commit: Whether to commit the transaction
+        :return: The queued job
+        """
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts or settings.job_max_attempts)
+        job = await self.uow.jobs.save(job)
+
+        if commit:
+            await self.uow.commit()
+
+        return job
+
+    async def get_by_id(self, id: int) -> Job:
+        """Retrieve a job by its ID.
+
+        :param id: The ID of the job
+        :return: The job
+        """
+        job = await self.uow.jobs.get_by_id(id)
+        if job is None:
+            raise ObjectNotFoundError("Job not found.")
+        return job
+
+    async def claim(self) -> Job | None:
+        """Lock the next due job for running, counting the attempt.
+
+        :return: The claimed job, None when no job is due
+        """
+        job = await self.uow.jobs.claim_next(utcnow())
+        await self.uow.commit()
+        return job
+
+    async def complete(self, id: int, result: dict[str, Any] | None) -> Job:
+        """Mark a running job as succeeded.
+
+        :param id: The ID of the job
+        :param result: JSON serializable result of the handler
+        :return: The updated job
+        """
+        job = await self.get_by_id(id)
+        job.status = JobStatus.SUCCEEDED
+        job.result = result
+        job.error = None
+        return await self._finish(job)
+
+    async def fail(self, id: int, error: str, *, retry: bool = True) -> Job:
+        """Record a failed attempt, scheduling a retry or dead-lettering the job.
+
+        :param id: The ID of the job
+        :param error: Description of the failure
+        :param retry: Whether the failure may succeed on a later attempt
+        :return: The updated job
+        """
+        job = await self.get_by_id(id)
+        job.error = error
+
+        if retry and job.attempts < job.max_attempts:
+            delay = min(settings.job_retry_backoff * 2 ** (job.attempts - 1), settings.job_retry_max_delay)
+            job.status = JobStatus.QUEUED
+            job.run_after = utcnow() + timedelta(seconds=delay)
+        else:
+            job.status = JobStatus.DEAD
+
+        return await self._finish(job)
+
+    async def release(self, id: int) -> Job:
+        """Put back an interrupted job without counting its attempt.
+
+        :param id: The ID of the job
+        :return: The updated job
+        """
+        job = await self.get_by_id(id)
+        job.status = JobStatus.QUEUED
+        job.attempts = max(job.attempts - 1, 0)
+        return await self._finish(job)
+
+    async def retry(self, id: int) -> Job:
+        """Queue a dead-lettered job again with a fresh set of attempts.
+
+        :param id: The ID of the job
+        :return: The updated job
+        """
+        job = await self.get_by_id(id)
+        if job.status != JobStatus.DEAD:
+            raise ValueError("Only dead jobs can be retried.")
+
+        job.status = JobStatus.QUEUED
+        job.attempts = 0
+        job.run_after = utcnow()
+        return await self._finish(job)
+
+    async def heartbeat(self, id: int) -> bool:
+        """Refresh the lock of a running job, so it is not taken for orphaned while its handler runs.
+
+        :param id: The ID of the job
+        :return: Whether the job was still running
+        """
+        running = await self.uow.jobs.heartbeat(id, utcnow())
+        await self.uow.commit()
+        return running
+
+    async def requeue_stale(self, lock_timeout: float) -> int:
+        """Queue again the running jobs whose worker died without finishing them.
+
+        :param lock_timeout: Seconds after which a running job is considered orphaned
+        :return: Number of jobs queued again
+        """
+        count = await self.uow.jobs.requeue_stale(utcnow() - timedelta(seconds=lock_timeout))
+        await self.uow.commit()
+        return count
+
+    async def _finish(self, job: Job) -> Job:
+        job.locked_at = None
+        job.updated_at = utcnow()
+        job = await self.uow.jobs.save(job)
+        await self.uow.commit()
+        return job
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.db import AsyncSessionLocal
+from app.core.settings import settings
+from app.domain.models import Job
+
+from .exceptions import UnknownJobKindError
+from .job_service import JobService, job_handlers
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """Pool of asyncio workers running the queued background jobs.
+
+    Workers claim due jobs from the database, so several processes may share
+    the queue. Idle workers poll it, and are woken up right away by
+    ``notify`` when a job is queued by this process. A running job refreshes
+    its lock every third of ``lock_timeout``; jobs whose lock got older, left
+    running by a dead worker of any process, are queued again at startup and
+    then once per ``lock_timeout`` while the queue is idle.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 2,
+        poll_interval: float = 2.0,
+        lock_timeout: float = 600.0,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+    ) -> None:
+        """Initialize a JobWorkerPool instance.
+
+        :param size: Number of jobs run at the same time
+        :type size: int
+        :param poll_interval: Seconds an idle worker waits before looking for due jobs again
+        :type poll_interval: float
+        :param lock_timeout: Seconds without a heartbeat after which a running job is considered orphaned
+        :type lock_timeout: float
+        :param session_factory: Factory of the database sessions used by the workers
+        :type session_factory: async_sessionmaker
+        """
+        self.size = size
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.session_factory = session_factory
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._requeued_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers are running."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Queue again the jobs orphaned by a previous run and start the workers."""
+        if self._tasks:
+            return
+
+        await self._requeue_stale()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{i}") for i in range(self.size)]
+
+    async def stop(self) -> None:
+        """Stop the workers, putting back the jobs they were running."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake up the idle workers, after a job was queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _requeue_stale(self) -> None:
+        """Queue again the jobs whose worker died, shared by the workers of the pool."""
+        self._requeued_at = asyncio.get_running_loop().time()
+        async with self.session_factory() as session:
+            requeued = await JobService(session=session).requeue_stale(self.lock_timeout)
+        if requeued:
+            logger.info("Requeued %d orphaned jobs", requeued)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Refresh the lock of a running job until cancelled, so long jobs are not requeued as orphaned."""
+        while True:
+            await asyncio.sleep(self.lock_timeout / 3)
+            try:
+                async with self.session_factory() as session:
+                    await JobService(session=session).heartbeat(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to refresh the lock of job %d", job_id)
+
+    async def _idle(self) -> None:
+        """Wait for a notification or the poll interval."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    job = await JobService(session=session).claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to claim a job")
+                job = None
+
+            if job is None:
+                if asyncio.get_running_loop().time() - self._requeued_at >= self.lock_timeout:
+                    try:
+                        await self._requeue_stale()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        logger.exception("Failed to requeue orphaned jobs")
+                await self._idle()
+            else:
+                await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        """Run one attempt of a claimed job and record its outcome."""
+        handler = job_handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise UnknownJobKindError(f"Unknown job kind: {job.kind}")
+            heartbeat = asyncio.create_task(self._heartbeat(job.id), name=f"job-heartbeat-{job.id}")
+            try:
+                async with self.session_factory() as session:
+                    result = await handler(session, job.payload)
+            finally:
+                heartbeat.cancel()
+        except asyncio.CancelledError:
+            async with self.session_factory() as session:
+                await JobService(session=session).release(job.id)
+            raise
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            logger.warning("Job %d (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, error)
+            async with self.session_factory() as session:
+                await JobService(session=session).fail(job.id, error, retry=not isinstance(exc, UnknownJobKindError))
+        else:
+            async with self.session_factory() as session:
+                await JobService(session=session).complete(job.id, result)
+
+
+job_worker_pool = JobWorkerPool(
+    size=settings.job_workers,
+    poll_interval=settings.job_poll_interval,
+    lock_timeout=settings.job_lock_timeout,
+)
@@ -1,7 +1,130 @@
+from collections.abc import Iterable
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.models import Pokedex
+from app.domain.schemas import EditionStats, PokedexInput, PokedexStats, RarityStats
+from app.libs.ligapokemon import LigaPokemon
+from app.repository.uow import AsyncUnitOfWork
+
 from .base import BaseService
 
 
-class PokedexService(BaseService):
+class PokedexService(BaseService[Pokedex, PokedexInput]):
     """Service class for managing Pokedex entities."""
 
-    ...
+    def __init__(
+        self,
+        *,
+        session: AsyncSession,
+        liga: LigaPokemon | None = None,
+        uow: AsyncUnitOfWork | None = None,
+    ) -> None:
+        """Initialize a PokedexService instance.
+
+        :param session: Database session
+        :param liga: Scraper, unused by pokedexes
+        :param uow: Unit of work shared with other services
+        """
+        super().__init__(
+            session=session,
+            liga=liga or LigaPokemon(),
+            entity_type=Pokedex,
+            fields_to_update={"name"},
+            uow=uow,
+        )
+
+    def _to_entity(self, data: PokedexInput) -> Pokedex:
+        """Convert PokedexInput data to a Pokedex entity.
+
+        :param data: PokedexInput data
+        :return: Pokedex entity
+        """
+        return Pokedex.model_validate({"name": data.name})
+
+    async def add_cards(self, id: int, card_ids: Iterable[int], commit: bool = True) -> tuple[int, list[int]]:
+        """Add many cards to a pokedex with set-based statements, skipping the ones already in it.
+
+        :param id: The ID of the pokedex
+        :param card_ids: IDs of the cards to add
+        :param commit: Whether to commit the transaction
+        :return: A tuple containing the number of cards added and the IDs of the cards that do not exist
+        :raises ObjectNotFoundError: If the pokedex does not exist
+        """
+        await self.get_by_id(id)
+        added, missing = await self.uow.pokedexes.add_cards(id, card_ids)
+
+        if commit:
+            await self.uow.commit()
+
+        return added, missing
+
+    async def remove_cards(self, id: int, card_ids: Iterable[int], commit: bool = True) -> int:
+        """Remove many cards from a pokedex with set-based statements.
+
+        :param id: The ID of the pokedex
+        :param card_ids: IDs of the cards to remove
+        :param commit: Whether to commit the transaction
+        :return: The number of cards removed
+        :raises ObjectNotFoundError: If the pokedex does not exist
+        """
+        await self.get_by_id(id)
+        removed = await self.uow.pokedexes.remove_cards(id, card_ids)
+
+        if commit:
+            await self.uow.commit()
+
+        return removed
+
+    async def get_stats(self, id: int) -> PokedexStats:
+        """Completion of a pokedex by edition and rarity, read from the incrementally maintained statistics.
+
+        :param id: The ID of the pokedex
+        :return: Cards owned and total, overall and for each edition the pokedex has cards of
+        :raises ObjectNotFoundError: If the pokedex does not exist
+        """
+        await self.get_by_id(id)
+        owned_rows, total_rows = await self.uow.pokedexes.get_stats(id)
+
+        totals: dict[int, dict[str, int]] = {}
+        for row in total_rows:
+            totals.setdefault(row.edition_id, {})[row.rarity] = row.cards
+
+        editions: dict[int, EditionStats] = {}
+        owned: dict[tuple[int, str], int] = {}
+        for row in owned_rows:
+            owned[(row.edition_id, row.rarity)] = row.owned
+            if row.edition_id not in editions:
+                edition_totals = totals.get(row.edition_id, {})
+                editions[row.edition_id] = EditionStats(
+                    edition_id=row.edition_id,
+                    edition_code=row.edition_code,
+                    edition_name=row.edition_name,
+                    owned=0,
+                    total=sum(edition_totals.values()),
+                )
+
+        for edition in editions.values():
+            for rarity, total in sorted(totals.get(edition.edition_id, {}).items()):
+                count = owned.get((edition.edition_id, rarity), 0)
+                edition.rarities.append(RarityStats(rarity=rarity, owned=count, total=total))
+                edition.owned += count
+
+        return PokedexStats(
+            pokedex_id=id,
+            owned=sum(edition.owned for edition in editions.values()),
+            editions=sorted(editions.values(), key=lambda edition: edition.edition_code),
+        )
+
+    async def rebuild_stats(self, commit: bool = True) -> tuple[int, int]:
+        """Recompute the completion statistics of every pokedex from scratch, to repair them.
+
+        :param commit: Whether to commit the transaction
+        :return: Number of pokedex and edition statistics rows written
+        """
+        rows = await self.uow.pokedexes.rebuild_stats()
+
+        if commit:
+            await self.uow.commit()
+
+        return rows
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+# Settings are read on import: point the app to a throwaway database before anything imports it
+os.environ["POKEMON_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["POKEMON_RESPONSE_CACHE_ENABLED"] = "false"
+os.environ["POKEMON_IMAGES_DIR"] = tempfile.mkdtemp()
+
+from collections.abc import Iterator  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.app_config import init_models  # noqa: E402
+from app.core.db import SessionLocal, async_engine  # noqa: E402
+from app.domain.models import Card, Edition  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Client of the app on a database holding 3 editions of 40 cards; the lifespan (scraper, workers) is not run."""
+    init_models()
+    with SessionLocal() as session:
+        editions = [Edition(code=f"E{i}", name=f"Edition {i}", year="1999") for i in range(3)]
+        session.add_all(editions)
+        session.flush()
+        session.add_all(
+            Card(card_id=str(i), set_id="120", name=f"Card {i}", rarity="Rare", edition_id=editions[i % 3].id)
+            for i in range(120)
+        )
+        session.commit()
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    """SQL statements run by the request handling engine while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, ARG001
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,51 @@
+"""Cached responses are revalidated against table versions kept by the database, whoever writes to it."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+
+from app.core.db import engine
+from app.core.settings import settings
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "response_cache_enabled", True)
+
+
+@pytest.mark.usefixtures("cache")
+def test_etag_changes_on_writes_of_other_connections(client: TestClient) -> None:
+    etag = client.get("/editions").headers["ETag"]
+    pokedexes = client.get("/pokedexes").headers["ETag"]
+    assert client.get("/editions", headers={"If-None-Match": etag}).status_code == 304
+
+    # A write the app's sessions know nothing about, as made by a CLI command or another process
+    with closing(sqlite3.connect(make_url(str(engine.url)).database)) as conn, conn:
+        conn.execute("UPDATE edition SET name = 'Renamed' WHERE code = 'E0'")
+
+    second = client.get("/editions", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert "Renamed" in second.text
+
+    # Writes to tables a route is not read from leave its ETag alone
+    assert client.get("/pokedexes").headers["ETag"] == pokedexes
+
+
+@pytest.mark.usefixtures("cache")
+def test_pokedex_filter_follows_entries(client: TestClient) -> None:
+    pokedex_id = client.post("/pokedexes", json={"name": "Mine"}).json()["data"]["id"]
+    url = f"/cards?pokedex_id={pokedex_id}"
+    before = client.get(url)
+    assert before.json()["metadata"]["total"] == 0
+
+    client.post(f"/pokedexes/{pokedex_id}/cards", json={"card_ids": [1, 2, 3]})
+    added = client.get(url, headers={"If-None-Match": before.headers["ETag"]})
+    assert added.status_code == 200
+    assert added.json()["metadata"]["total"] == 3
+
+    client.request("DELETE", f"/pokedexes/{pokedex_id}/cards", json={"card_ids": [1]})
+    assert client.get(url).json()["metadata"]["total"] == 2
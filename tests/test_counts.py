@@ -0,0 +1,48 @@
+"""The cached totals of listings only change once the writes they count are committed."""
+
+import pytest
+from sqlmodel import Session
+
+from app.core.db import SessionLocal
+from app.domain.models import Edition
+from app.repository.base import Repository
+from app.repository.repositories import EditionRepository
+
+
+def count(session: Session) -> int:
+    return EditionRepository(session, Edition).count()
+
+
+@pytest.mark.usefixtures("client")
+def test_counts_are_dropped_on_commit_only() -> None:
+    with SessionLocal() as reader, SessionLocal() as writer:
+        before = count(reader)
+        EditionRepository(writer, Edition).save(Edition(code="NEW", name="New", year="2000"))
+
+        # Flushed, not committed: the writer sees its own edition, the others the committed total, still cached
+        assert count(writer) == before + 1
+        assert count(reader) == before
+
+        writer.rollback()
+        assert count(reader) == before
+
+        EditionRepository(writer, Edition).save(Edition(code="NEW", name="New", year="2000"))
+        writer.commit()
+        reader.rollback()  # end the reader's snapshot
+        assert count(reader) == before + 1
+
+
+@pytest.mark.usefixtures("client")
+def test_counts_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Repository, "count_cache_size", 3)
+    Repository._counts.clear()
+    with SessionLocal() as session:
+        repository = EditionRepository(session, Edition)
+        for i in range(10):
+            repository.count(filters={"code": f"X{i}"})
+        assert len(Repository._counts) == 3
+
+        # Reading a total keeps it, the least recently used one goes
+        repository.count(filters={"code": "X7"})
+        repository.count(filters={"code": "Y"})
+        assert {key[1][0][1] for key in Repository._counts} == {"X7", "X9", "Y"}
@@ -0,0 +1,35 @@
+"""Cursors are opaque to clients: any they tamper with is rejected with a 400, never reaching the query."""
+
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def cursor(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "not base64!",
+        cursor([1, "n"]),
+        cursor({"k": 1, "d": "n"}),
+        cursor({"k": [1], "d": "x"}),
+        cursor({"k": [{"a": 1}], "d": "n"}),
+        cursor({"k": [[1, 2]], "d": "n"}),
+        cursor({"k": [], "d": "n"}),
+        cursor({"k": [1, 2], "d": "n"}),
+    ],
+)
+def test_tampered_cursors_are_rejected(client: TestClient, value: str) -> None:
+    assert client.get("/cards", params={"cursor": value}).status_code == 400
+
+
+def test_cursors_follow_the_listing(client: TestClient) -> None:
+    first = client.get("/cards", params={"page_size": 5, "sort": "-name"}).json()
+    second = client.get("/cards", params={"page_size": 5, "sort": "-name", "cursor": first["metadata"]["next"]})
+    assert second.status_code == 200
+    assert {card["id"] for card in first["data"]}.isdisjoint(card["id"] for card in second.json()["data"])
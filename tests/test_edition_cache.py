@@ -0,0 +1,36 @@
+"""Edition lookups are cached by code, committed rows only."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.db import AsyncSessionLocal
+from app.domain.schemas import EditionLoad
+from app.service import EditionCache, EditionService
+
+
+@pytest.mark.usefixtures("client")
+def test_uncommitted_editions_are_not_cached() -> None:
+    cache = EditionCache()
+
+    async def scenario() -> None:
+        async with AsyncSessionLocal() as session:
+            service = EditionService(session=session, cache=cache)
+            data = EditionLoad(code="ROLL", name="Rolled back", year="2001")
+            await service.get_or_create_edition("ROLL", commit=False, data=data)
+            assert await service.get_by_code("ROLL") is not None
+            await session.rollback()
+        assert cache.get("ROLL") is None
+
+        async with AsyncSessionLocal() as session:
+            assert await EditionService(session=session, cache=cache).get_by_code("ROLL") is None
+            assert await EditionService(session=session, cache=cache).get_by_code("E1") is not None
+        assert cache.get("E1") is not None
+
+    asyncio.run(scenario())
+
+
+def test_edition_cache_metrics(client: TestClient) -> None:
+    stats = client.get("/metrics/editions").json()["data"]
+    assert set(stats) == {"hits", "misses", "hit_rate", "size"}
@@ -0,0 +1,36 @@
+"""Card images are served from the downloaded originals, resized on first use."""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.core.settings import settings
+
+
+def original(client: TestClient, id: int) -> Path:
+    card = client.get("/cards", params={"id": id}).json()["data"][0]
+    return Path(settings.images_dir) / f"{card['edition_code']}_{card['card_id']}_{card['set_id']}.jpg"
+
+
+def test_thumbnails_are_generated_once(client: TestClient) -> None:
+    path = original(client, 2)
+    Image.new("RGB", (600, 840), "red").save(path, "JPEG")
+
+    response = client.get("/cards/2/image", params={"size": "thumb"})
+    assert response.status_code == 200
+    assert Image.open(path.parent / "thumb" / path.name).width == 160
+    assert (
+        client.get(
+            "/cards/2/image", params={"size": "thumb"}, headers={"If-None-Match": response.headers["ETag"]}
+        ).status_code
+        == 304
+    )
+
+
+def test_unreadable_originals_are_dropped(client: TestClient) -> None:
+    path = original(client, 1)
+    path.write_bytes(b"<html>not an image</html>")
+
+    assert client.get("/cards/1/image", params={"size": "thumb"}).status_code == 404
+    assert not path.exists()
@@ -0,0 +1,34 @@
+"""Guards against N+1 queries: a listing runs the same statements whatever its page size."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.repository.base import Repository
+
+
+def count_statements(client: TestClient, statements: list[str], url: str) -> int:
+    Repository._counts.clear()  # count on every request instead of reusing a cached total
+    statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/cards?page_size={size}",
+        "/cards?page=2&page_size={size}",
+        "/cards?page_size={size}&edition_code=E1&sort=-name",
+        "/editions?page_size={size}",
+    ],
+)
+def test_listing_statements_do_not_grow_with_page_size(client: TestClient, statements: list[str], url: str) -> None:
+    small = count_statements(client, statements, url.format(size=5))
+    large = count_statements(client, statements, url.format(size=50))
+    assert small == large
+
+
+def test_card_listing_runs_page_and_count(client: TestClient, statements: list[str]) -> None:
+    assert count_statements(client, statements, "/cards?page_size=20") == 2
+    assert count_statements(client, statements, "/cards?page_size=20&include_total=false") == 1